@@ -79,7 +79,7 @@ def print_final_summary(result: dict):
     print(f"   • Tests réussis : {result['tests_passed']}/{result['total_tests']}")
     
     print("\n📁 FICHIERS DE SORTIE :")
-    print(f"   • Logs détaillés : logs/experiment_data.json")
+    print(f"   • Logs détaillés : logs/experiment_data.jsonl")
     print(f"   • Code refactoré : {result.get('output_directory', 'sandbox/')}")
     
     print("="*70 + "\n")
@@ -3,41 +3,229 @@ auditor_agent.py - Agent Auditeur
 Analyse le code et produit un plan de refactoring
 """
 import os
+import re
+import ast
 import json
+import atexit
+import datetime
+import hashlib
+import orjson
 import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.utils.logger import log_experiment, ActionType
 from src.tools.static_analyzer import run_pylint_on_file
 
+# Clôture markdown autour d'un bloc JSON/Python : précompilée une fois,
+# une seule passe sur la réponse au lieu de plusieurs .split("```")
+_FENCE_RE = re.compile(r"```(?:python|json)?\s*\n?(.*?)```", re.DOTALL)
+
+# Gabarits de la partie dynamique des prompts : construits une seule fois
+# au chargement du module et formatés via %, au lieu de reconstruire la
+# f-string multi-lignes à chaque fichier
+_USER_PROMPT_TMPL = """**Fichier** : %s
+
+**Code** :
+```python
+%s
+```
+
+**Score Pylint** : %s/10"""
+
+_BATCH_SECTION_TMPL = """---FILE: %s---
+**Score Pylint** : %s/10
+```python
+%s
+```"""
+
+# Configuration genai et modèles partagés au niveau du processus : évite
+# de refaire l'auth et de réallouer un client à chaque instanciation
+# d'agent (max_iterations × N agents)
+_CONFIGURED = False
+_MODELS = {}
+
+
+def _get_model(model_name: str, **kwargs) -> genai.GenerativeModel:
+    """Retourne un GenerativeModel partagé, en configurant genai au premier appel"""
+    global _CONFIGURED
+    if not _CONFIGURED:
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY non trouvée dans .env")
+        genai.configure(api_key=api_key)
+        _CONFIGURED = True
+
+    if model_name not in _MODELS:
+        _MODELS[model_name] = genai.GenerativeModel(model_name, **kwargs)
+    return _MODELS[model_name]
+
 
 class AuditorAgent:
     """
     Agent responsable de l'audit du code
     Utilise Gemini + Pylint pour analyser et détecter les problèmes
     """
-    
-    def __init__(self):
-        """Initialise l'agent Auditeur avec le LLM"""
-        # Configuration du modèle LLM
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY non trouvée dans .env")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
-        
+
+    # Nombre maximum d'appels Gemini simultanés (respecte le QPS du provider)
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # Taille maximale (en caractères de code) d'un lot de fichiers envoyé
+    # dans une seule requête Gemini
+    MAX_BATCH_CHARS = 25000
+
+    # Score pylint au-delà duquel un fichier sans issue est considéré
+    # propre : l'appel LLM est alors inutile
+    CLEAN_SCORE_THRESHOLD = 9.0
+
+    def __init__(self, clean_score_threshold: float = None):
+        """
+        Initialise l'agent Auditeur avec le LLM
+
+        Args:
+            clean_score_threshold: Score pylint à partir duquel un fichier
+                sans issue est jugé propre (défaut: CLEAN_SCORE_THRESHOLD)
+        """
+        # Configuration du modèle LLM (client partagé au niveau du module)
+        self.model = _get_model("gemini-2.5-flash")
+
+        if clean_score_threshold is not None:
+            self.clean_score_threshold = clean_score_threshold
+        else:
+            self.clean_score_threshold = self.CLEAN_SCORE_THRESHOLD
+
         # Charger le prompt système
         self.system_prompt = self._load_system_prompt()
-        
+
+        # Bloc statique identique à chaque appel, placé EN TÊTE du prompt :
+        # Gemini cache les préfixes répétés (implicit prompt caching), donc
+        # seul le contenu spécifique au fichier (en queue) est rebillé
+        self._static_prefix = f"""{self.system_prompt}
+
+Analyse le fichier Python fourni et identifie UNIQUEMENT les 3-5 problèmes les PLUS CRITIQUES.
+
+Fournis un plan JSON COMPACT (max 10 lignes) :
+{{
+    "file": "CHEMIN_COMPLET_DU_FICHIER",
+    "issues": [
+        {{"type": "bug", "line": 1, "description": "Problème X", "priority": "HIGH", "suggestion": "Correction Y"}},
+        {{"type": "pep8", "line": 2, "description": "Problème Z", "priority": "MEDIUM", "suggestion": "Fix W"}}
+    ]
+}}
+
+IMPORTANT :
+- Maximum 5 issues
+- Descriptions COURTES (max 50 caractères)
+- JSON valide UNIQUEMENT, RIEN d'autre
+- PAS de markdown ```json
+- TOUS les champs requis: type, line, description, priority, suggestion"""
+
+        # Cache persistant des analyses LLM : entre deux itérations la
+        # plupart des fichiers sont inchangés, inutile de repayer un
+        # aller-retour Gemini pour le même contenu
+        self._cache_path = Path("logs/auditor_cache.json")
+        self._cache = self._load_cache()
+
+        # Cache de contexte explicite Gemini pour le préfixe statique
+        # (facturé au tarif réduit sur tous les appels du run)
+        self._cached_content = None
+        self._register_prompt_cache()
+
         print("✅ Auditeur initialisé (Gemini 2.5 Flash)")
-    
+
+    def _register_prompt_cache(self):
+        """
+        Tente d'enregistrer le préfixe statique comme CachedContent Gemini
+
+        En cas d'échec (API indisponible, préfixe sous la taille minimale
+        de cache, quota...), on continue avec le préfixe envoyé inline :
+        le caching implicite de Gemini s'applique alors.
+        """
+        try:
+            self._cached_content = genai.caching.CachedContent.create(
+                model="models/gemini-2.5-flash",
+                contents=[self._static_prefix],
+                ttl=datetime.timedelta(hours=1),
+            )
+            self.model = genai.GenerativeModel.from_cached_content(
+                self._cached_content
+            )
+            atexit.register(self._delete_prompt_cache)
+        except Exception:
+            self._cached_content = None
+
+    def _delete_prompt_cache(self):
+        """Supprime le CachedContent côté serveur à la fin du run"""
+        if self._cached_content is not None:
+            try:
+                self._cached_content.delete()
+            except Exception:
+                pass
+            self._cached_content = None
+
+    def _build_contents(self, user_prompt: str) -> list:
+        """Contenu d'un appel : préfixe inline seulement s'il n'est pas en cache serveur"""
+        if self._cached_content is not None:
+            return [user_prompt]
+        return [self._static_prefix, user_prompt]
+
+    def _load_cache(self) -> dict:
+        """Charge le cache des analyses depuis le disque (dict vide si absent/corrompu)"""
+        if self._cache_path.exists():
+            try:
+                # orjson.JSONDecodeError est une sous-classe de json.JSONDecodeError
+                return orjson.loads(self._cache_path.read_bytes())
+            except (json.JSONDecodeError, OSError):
+                return {}
+        return {}
+
+    def _save_cache(self):
+        """Persiste le cache des analyses sur disque"""
+        try:
+            self._cache_path.parent.mkdir(exist_ok=True)
+            with open(self._cache_path, 'wb') as f:
+                f.write(orjson.dumps(self._cache))
+        except OSError as e:
+            print(f"   ⚠️  Impossible d'écrire le cache auditeur : {e}")
+
+    @staticmethod
+    def _cache_key(raw_content: bytes, pylint_score: float) -> str:
+        """Clé de cache : hash des bytes du fichier + score pylint"""
+        digest = hashlib.blake2b(raw_content, digest_size=16).hexdigest()
+        return f"{digest}:{pylint_score}"
+
+    def _log_skipped(self, file_path: str, pylint_score: float,
+                     reason: str, status: str) -> None:
+        """Log obligatoire pour les fichiers court-circuités (sans LLM)"""
+        log_experiment(
+            agent_name="Auditor_Agent",
+            model_used="N/A (Deterministic)",
+            action=ActionType.ANALYSIS,
+            details={
+                "file_analyzed": file_path,
+                "input_prompt": f"Analyse de {file_path}",
+                "output_response": reason,
+                "pylint_score": pylint_score
+            },
+            status=status
+        )
+
+    # Prompts système déjà lus, partagés entre instances : une lecture
+    # disque par fichier de prompt et par processus
+    _SYSTEM_PROMPT_CACHE = {}
+
     def _load_system_prompt(self) -> str:
-        """Charge le prompt système depuis le fichier"""
+        """Charge le prompt système depuis le fichier (mémoïsé)"""
         prompt_path = Path("src/prompts/auditor_prompt.txt")
+        key = str(prompt_path)
+        cache = AuditorAgent._SYSTEM_PROMPT_CACHE
+        if key in cache:
+            return cache[key]
         if prompt_path.exists():
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        
+            # Lecture binaire + decode : évite le décodeur de fins de
+            # ligne du mode texte
+            cache[key] = prompt_path.read_bytes().decode('utf-8')
+            return cache[key]
+
         # Fallback si le fichier n'existe pas
         return """Tu es un expert Python chargé d'auditer du code.
 
@@ -54,188 +242,531 @@ Retourne un plan structuré en JSON avec :
 - suggestions: recommandations de correction
 
 Sois précis et constructif."""
-    
+
     def analyze(self, files: list) -> dict:
         """
         Analyse les fichiers et retourne un plan de refactoring
-        
+
+        Les petits fichiers sont regroupés en lots (un seul appel Gemini
+        par lot pour amortir le coût fixe par requête) et les lots sont
+        traités en parallèle via un pool de threads borné, les appels
+        Gemini étant I/O-bound.
+
         Args:
             files: Liste des chemins de fichiers à analyser
-            
+
         Returns:
             Dict contenant le plan de refactoring avec tous les problèmes détectés
         """
         print(f"🔍 Analyse de {len(files)} fichiers...\n")
-        
-        all_issues = []
-        
+
+        batches = self._pack_files(files)
+        if len(batches) < len(files):
+            print(f"   📦 {len(files)} fichiers regroupés en {len(batches)} requête(s)\n")
+
+        max_workers = min(self.MAX_CONCURRENT_REQUESTS, max(len(batches), 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # executor.map préserve l'ordre des lots dans les résultats
+            results = list(executor.map(self._analyze_batch, batches))
+
+        all_issues = [
+            analysis
+            for batch_result in results
+            for analysis in batch_result
+            if analysis is not None
+        ]
+
+        self._save_cache()
+
+        print(f"\n✅ Audit terminé : {len(all_issues)} fichiers analysés\n")
+
+        return {
+            "issues": all_issues,
+            "total_files": len(files),
+            "status": "completed"
+        }
+
+    def _pack_files(self, files: list, max_chars: int = None) -> list:
+        """
+        Regroupe les fichiers en lots de taille bornée (bin packing glouton)
+
+        Le coût fixe par requête (TTFT, framing, préfixe) domine pour les
+        petits fichiers : K fichiers dans une requête coûtent ~1 aller-retour
+        au lieu de K.
+
+        Args:
+            files: Liste des chemins de fichiers
+            max_chars: Taille maximale d'un lot (défaut: MAX_BATCH_CHARS)
+
+        Returns:
+            Liste de lots (listes de chemins)
+        """
+        max_chars = max_chars or self.MAX_BATCH_CHARS
+
+        batches = []
+        current, current_size = [], 0
+
         for file_path in files:
-            print(f"   📄 Analyse : {Path(file_path).name}")
-            
             try:
-                # 1. Analyse statique avec Pylint
+                file_size = Path(file_path).stat().st_size
+            except OSError:
+                file_size = max_chars  # taille inconnue → fichier isolé
+
+            if current and current_size + file_size > max_chars:
+                batches.append(current)
+                current, current_size = [], 0
+
+            current.append(file_path)
+            current_size += file_size
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _analyze_batch(self, batch: list) -> list:
+        """
+        Analyse un lot de fichiers en un seul appel Gemini
+
+        Les fichiers déjà en cache ne sont pas renvoyés au LLM. Si la
+        réponse groupée ne peut pas être parsée, retombe sur l'analyse
+        fichier par fichier.
+
+        Args:
+            batch: Liste de chemins de fichiers du lot
+
+        Returns:
+            Liste des analyses, dans l'ordre du lot (None pour les échecs)
+        """
+        if len(batch) == 1:
+            return [self._analyze_one(batch[0])]
+
+        pending = []   # fichiers nécessitant réellement un appel LLM
+        results = {}   # file_path -> analyse
+
+        for file_path in batch:
+            file_name = Path(file_path).name
+            print(f"   📄 Analyse : {file_name}")
+            try:
                 pylint_score, pylint_issues = run_pylint_on_file(file_path)
                 print(f"      📊 Score Pylint : {pylint_score}/10")
-                
-                # 2. Lecture du code
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code_content = f.read()
-                
-                # 3. Analyse avec le LLM - PROMPT SIMPLIFIÉ
-                user_prompt = f"""Analyse ce fichier Python et identifie UNIQUEMENT les 3-5 problèmes les PLUS CRITIQUES.
 
-**Fichier** : {Path(file_path).name}
+                # Fichier déjà propre : pas d'appel LLM pour ce fichier
+                if pylint_score >= self.clean_score_threshold and not pylint_issues:
+                    print(f"      ✨ Fichier propre, appel LLM ignoré")
+                    self._log_skipped(
+                        file_path, pylint_score,
+                        f"Fichier propre (pylint {pylint_score}/10), "
+                        "appel LLM ignoré",
+                        "SKIPPED_CLEAN"
+                    )
+                    results[file_path] = {"file": file_path, "issues": []}
+                    continue
 
-**Code** :
-```python
-{code_content[:1500]}
-```
+                # Un syscall + décodage en bloc ; les bytes bruts servent
+                # de clé de cache sans ré-encodage
+                raw_content = Path(file_path).read_bytes()
+                code_content = raw_content.decode('utf-8')
+            except Exception as e:
+                print(f"      ❌ Erreur lors de l'analyse : {e}")
+                continue
 
-**Score Pylint** : {pylint_score}/10
+            cache_key = self._cache_key(raw_content, pylint_score)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                print(f"      ⚡ Analyse en cache (fichier inchangé)")
+                self._log_skipped(
+                    file_path, pylint_score,
+                    "Analyse réutilisée depuis le cache (fichier inchangé)",
+                    "SKIPPED_CACHE"
+                )
+                analysis = dict(cached)
+                analysis["file"] = file_path
+                results[file_path] = analysis
+            else:
+                # Extrait AST calculé dès maintenant : seul l'extrait part
+                # dans le prompt groupé
+                excerpt = self._extract_relevant(code_content, pylint_issues)
+                pending.append((file_path, excerpt, pylint_score, cache_key))
 
-Fournis un plan JSON COMPACT (max 10 lignes) :
-{{
-    "file": "CHEMIN_COMPLET_DU_FICHIER",
-    "issues": [
-        {{"type": "bug", "line": 1, "description": "Problème X", "priority": "HIGH", "suggestion": "Correction Y"}},
-        {{"type": "pep8", "line": 2, "description": "Problème Z", "priority": "MEDIUM", "suggestion": "Fix W"}}
-    ]
-}}
+        if pending:
+            batch_results = self._analyze_pending_batch(pending)
+            if batch_results is None:
+                # Fallback : réponse groupée inutilisable → fichier par fichier
+                print(f"      🔁 Lot illisible, analyse fichier par fichier...")
+                for file_path, _, _, _ in pending:
+                    results[file_path] = self._analyze_one(file_path)
+            else:
+                results.update(batch_results)
 
-IMPORTANT : 
-- Maximum 5 issues
-- Descriptions COURTES (max 50 caractères)
-- JSON valide UNIQUEMENT, RIEN d'autre
-- PAS de markdown ```json
-- TOUS les champs requis: type, line, description, priority, suggestion"""
-                
-                # Appel au LLM
-                response = self.model.generate_content(
-                    f"{self.system_prompt}\n\n{user_prompt}"
+        return [results.get(file_path) for file_path in batch]
+
+    def _analyze_pending_batch(self, pending: list) -> dict:
+        """
+        Envoie plusieurs fichiers dans une seule requête Gemini
+
+        Args:
+            pending: Liste de tuples (file_path, extrait, pylint_score, cache_key)
+
+        Returns:
+            Dict file_path -> analyse, ou None si la réponse est inexploitable
+        """
+        sections = [
+            _BATCH_SECTION_TMPL % (file_path, pylint_score, excerpt)
+            for file_path, excerpt, pylint_score, _ in pending
+        ]
+
+        user_prompt = (
+            "Analyse CHACUN des fichiers suivants (mêmes règles que ci-dessus).\n"
+            "Retourne un JSON ARRAY avec UNE entrée par fichier, dans le même ordre :\n"
+            '[{"file": "CHEMIN", "issues": [...]}, ...]\n\n'
+            + "\n\n".join(sections)
+        )
+
+        try:
+            response = self.model.generate_content(
+                self._build_contents(user_prompt)
+            )
+
+            # Log obligatoire
+            log_experiment(
+                agent_name="Auditor_Agent",
+                model_used="gemini-2.5-flash",
+                action=ActionType.ANALYSIS,
+                details={
+                    "files_analyzed": [fp for fp, _, _, _ in pending],
+                    "input_prompt": user_prompt[:500],
+                    "output_response": response.text[:500],
+                    "batch_size": len(pending)
+                },
+                status="SUCCESS"
+            )
+
+            clean_response = self._strip_json_fences(response.text)
+            parsed = orjson.loads(clean_response)
+            if not isinstance(parsed, list):
+                return None
+        except json.JSONDecodeError as e:
+            print(f"      ⚠️  Erreur parsing JSON (lot) : {e}")
+            return None
+        except Exception as e:
+            print(f"      ❌ Erreur lors de l'analyse du lot : {e}")
+            log_experiment(
+                agent_name="Auditor_Agent",
+                model_used="gemini-2.5-flash",
+                action=ActionType.DEBUG,
+                details={
+                    "files_analyzed": [fp for fp, _, _, _ in pending],
+                    "input_prompt": f"Analyse groupée de {len(pending)} fichiers",
+                    "output_response": f"Erreur: {str(e)}",
+                    "error": str(e)
+                },
+                status="FAILURE"
+            )
+            return None
+
+        # Réassocier chaque entrée du tableau à son fichier :
+        # par nom de fichier si possible, sinon par position
+        index_by_name = {
+            Path(file_path).name: i
+            for i, (file_path, _, _, _) in enumerate(pending)
+        }
+
+        results = {}
+        for idx, entry in enumerate(parsed):
+            if not isinstance(entry, dict):
+                continue
+            i = index_by_name.get(Path(str(entry.get("file", ""))).name)
+            if i is None:
+                i = idx if idx < len(pending) else None
+            if i is None:
+                continue
+
+            file_path, code_content, pylint_score, cache_key = pending[i]
+            analysis = self._validate_analysis(entry, file_path, pylint_score)
+
+            issues_count = len(analysis.get("issues", []))
+            print(f"      🐛 {Path(file_path).name}: {issues_count} problèmes détectés")
+
+            self._cache[cache_key] = analysis
+            results[file_path] = analysis
+
+        # Fichiers absents de la réponse groupée → analyse individuelle
+        for file_path, _, _, _ in pending:
+            if file_path not in results:
+                results[file_path] = self._analyze_one(file_path)
+
+        return results
+
+    # Budget de caractères de code envoyés au LLM par fichier
+    CODE_BUDGET = 1500
+
+    def _extract_relevant(self, code_content: str, pylint_issues: list,
+                          budget: int = None) -> str:
+        """
+        Sélectionne l'extrait de code le plus pertinent sous un budget donné
+
+        Tronquer brutalement à N caractères fait rater les vrais bugs au
+        LLM (et coûte des itérations entières du swarm). On découpe donc
+        le fichier par unité AST : le bloc d'imports est toujours inclus,
+        puis les fonctions/classes contenant des lignes signalées par
+        pylint sont prises en priorité, le reste dans l'ordre du fichier,
+        jusqu'à épuisement du budget.
+
+        Args:
+            code_content: Code source complet du fichier
+            pylint_issues: Issues pylint (dicts avec un champ "line")
+            budget: Taille maximale de l'extrait (défaut: CODE_BUDGET)
+
+        Returns:
+            Extrait de code tenant dans le budget
+        """
+        budget = budget or self.CODE_BUDGET
+
+        if len(code_content) <= budget:
+            return code_content
+
+        try:
+            tree = ast.parse(code_content)
+        except SyntaxError:
+            # Fichier non parsable → troncature brute comme avant
+            return code_content[:budget]
+
+        lines = code_content.splitlines()
+        flagged_lines = {
+            issue.get("line") for issue in pylint_issues
+            if isinstance(issue, dict) and issue.get("line")
+        }
+
+        import_blocks = []
+        ranked_blocks = []  # (priorité, position, texte)
+
+        for node in tree.body:
+            start = node.lineno - 1
+            end = getattr(node, "end_lineno", node.lineno)
+            text = "\n".join(lines[start:end])
+
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                import_blocks.append(text)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                   ast.ClassDef)):
+                has_flag = any(start + 1 <= ln <= end for ln in flagged_lines)
+                ranked_blocks.append((0 if has_flag else 1, start, text))
+            else:
+                ranked_blocks.append((2, start, text))
+
+        header = "\n".join(import_blocks)
+        used = len(header)
+
+        # Inclusion gloutonne : unités signalées par pylint d'abord,
+        # puis le reste dans l'ordre du fichier
+        selected = []
+        for _, start, text in sorted(ranked_blocks):
+            if used + len(text) + 2 > budget:
+                continue
+            selected.append((start, text))
+            used += len(text) + 2
+
+        body = "\n\n".join(text for _, text in sorted(selected))
+        excerpt = f"{header}\n\n{body}".strip() if header else body
+
+        return excerpt if excerpt else code_content[:budget]
+
+    @staticmethod
+    def _strip_json_fences(text: str) -> str:
+        """Enlève les éventuelles clôtures markdown ```json autour du JSON"""
+        match = _FENCE_RE.search(text)
+        return (match.group(1) if match else text).strip()
+
+    def _validate_analysis(self, analysis: dict, file_path: str,
+                           pylint_score: float) -> dict:
+        """
+        Valide et normalise une analyse renvoyée par le LLM
+
+        Force le chemin complet du fichier et ne conserve que les issues
+        possédant tous les champs requis avec des types corrects.
+        """
+        # IMPORTANT : Forcer le chemin complet du fichier
+        analysis["file"] = file_path
+
+        # VALIDATE: Ensure all issues have required fields - FIXED VERSION
+        if "issues" in analysis:
+            valid_issues = []
+            for issue in analysis.get("issues", []):
+                # CRITICAL FIX: Check for exact required field names
+                required_fields = ["type", "line", "description", "priority", "suggestion"]
+                has_all_fields = all(field in issue for field in required_fields)
+
+                if has_all_fields:
+                    # Ensure types are correct
+                    try:
+                        issue["line"] = int(issue["line"])
+                        issue["priority"] = str(issue["priority"]).upper()
+                        valid_issues.append(issue)
+                    except (ValueError, TypeError) as e:
+                        print(f"      ⚠️  Skipping issue with invalid types: {issue}")
+                else:
+                    # Show which fields are missing
+                    missing = [f for f in required_fields if f not in issue]
+                    print(f"      ⚠️  Skipping incomplete issue (missing: {missing}): {issue}")
+
+            analysis["issues"] = valid_issues
+
+            if not valid_issues:
+                print(f"      ⚠️  No valid issues in LLM response, using fallback")
+                analysis["issues"] = [{
+                    "type": "pylint",
+                    "line": 1,
+                    "description": f"Score Pylint: {pylint_score}/10",
+                    "priority": "MEDIUM",
+                    "suggestion": "Corriger violations PEP8"
+                }]
+
+        # Vérifier la structure
+        if "issues" not in analysis:
+            print(f"      ⚠️  JSON invalide - structure incorrecte")
+            # Fallback basique
+            analysis = {
+                "file": file_path,
+                "issues": [
+                    {
+                        "type": "pylint",
+                        "line": 1,
+                        "description": f"Score Pylint: {pylint_score}/10",
+                        "priority": "MEDIUM",
+                        "suggestion": "Corriger violations PEP8"
+                    }
+                ]
+            }
+
+        return analysis
+
+    def _analyze_one(self, file_path: str) -> dict:
+        """
+        Analyse un seul fichier (Pylint + LLM) et retourne le dict d'analyse
+
+        Args:
+            file_path: Chemin du fichier à analyser
+
+        Returns:
+            Dict d'analyse ({"file": ..., "issues": [...]}) ou None si erreur
+        """
+        # Un seul objet Path par fichier : name est réutilisé par le print,
+        # le prompt et les logs
+        file_name = Path(file_path).name
+        print(f"   📄 Analyse : {file_name}")
+
+        try:
+            # 1. Analyse statique avec Pylint
+            pylint_score, pylint_issues = run_pylint_on_file(file_path)
+            print(f"      📊 Score Pylint : {pylint_score}/10")
+
+            # Fichier déjà propre : inutile de demander au LLM d'inventer
+            # des problèmes, on économise l'aller-retour Gemini
+            if pylint_score >= self.clean_score_threshold and not pylint_issues:
+                print(f"      ✨ Fichier propre, appel LLM ignoré")
+                self._log_skipped(
+                    file_path, pylint_score,
+                    f"Fichier propre (pylint {pylint_score}/10), "
+                    "appel LLM ignoré",
+                    "SKIPPED_CLEAN"
                 )
-                
-                # Log obligatoire
-                log_experiment(
-                    agent_name="Auditor_Agent",
-                    model_used="gemini-2.5-flash",
-                    action=ActionType.ANALYSIS,
-                    details={
-                        "file_analyzed": file_path,
-                        "input_prompt": user_prompt[:500],
-                        "output_response": response.text[:500],
-                        "pylint_score": pylint_score,
-                        "code_length": len(code_content)
-                    },
-                    status="SUCCESS"
+                return {"file": file_path, "issues": []}
+
+            # 2. Lecture du code : un seul syscall + décodage en bloc,
+            # et les bytes bruts servent directement de clé de cache
+            raw_content = Path(file_path).read_bytes()
+            code_content = raw_content.decode('utf-8')
+
+            # Court-circuit : contenu déjà analysé lors d'une itération
+            # précédente → on réutilise l'analyse sans appel LLM
+            cache_key = self._cache_key(raw_content, pylint_score)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                print(f"      ⚡ Analyse en cache (fichier inchangé)")
+                self._log_skipped(
+                    file_path, pylint_score,
+                    "Analyse réutilisée depuis le cache (fichier inchangé)",
+                    "SKIPPED_CACHE"
                 )
-                
-                # Parser la réponse JSON
-                try:
-                    # Nettoyer la réponse (enlever ```json si présent)
-                    clean_response = response.text.strip()
-                    if "```json" in clean_response:
-                        clean_response = clean_response.split("```json")[1].split("```")[0]
-                    elif "```" in clean_response:
-                        clean_response = clean_response.split("```")[1].split("```")[0]
-                    
-                    # Parser le JSON
-                    analysis = json.loads(clean_response)
-                    
-                    # IMPORTANT : Forcer le chemin complet du fichier
-                    analysis["file"] = file_path
-
-                    # VALIDATE: Ensure all issues have required fields - FIXED VERSION
-                    if "issues" in analysis:
-                        valid_issues = []
-                        for issue in analysis.get("issues", []):
-                            # CRITICAL FIX: Check for exact required field names
-                            required_fields = ["type", "line", "description", "priority", "suggestion"]
-                            has_all_fields = all(field in issue for field in required_fields)
-                            
-                            if has_all_fields:
-                                # Ensure types are correct
-                                try:
-                                    issue["line"] = int(issue["line"])
-                                    issue["priority"] = str(issue["priority"]).upper()
-                                    valid_issues.append(issue)
-                                except (ValueError, TypeError) as e:
-                                    print(f"      ⚠️  Skipping issue with invalid types: {issue}")
-                            else:
-                                # Show which fields are missing
-                                missing = [f for f in required_fields if f not in issue]
-                                print(f"      ⚠️  Skipping incomplete issue (missing: {missing}): {issue}")
-                        
-                        analysis["issues"] = valid_issues
-                        
-                        if not valid_issues:
-                            print(f"      ⚠️  No valid issues in LLM response, using fallback")
-                            analysis["issues"] = [{
-                                "type": "pylint",
-                                "line": 1,
-                                "description": f"Score Pylint: {pylint_score}/10",
-                                "priority": "MEDIUM",
-                                "suggestion": "Corriger violations PEP8"
-                            }]
-                    
-                    
-                    # Vérifier la structure
-                    if "issues" not in analysis:
-                        print(f"      ⚠️  JSON invalide - structure incorrecte")
-                        # Fallback basique
-                        analysis = {
-                            "file": file_path,
-                            "issues": [
-                                {
-                                    "type": "pylint",
-                                    "line": 1,
-                                    "description": f"Score Pylint: {pylint_score}/10",
-                                    "priority": "MEDIUM",
-                                    "suggestion": "Corriger violations PEP8"
-                                }
-                            ]
-                        }
-                    
-                    all_issues.append(analysis)
-                    
-                    issues_count = len(analysis.get("issues", []))
-                    print(f"      🐛 {issues_count} problèmes détectés")
-                    
-                except json.JSONDecodeError as e:
-                    print(f"      ⚠️  Erreur parsing JSON : {e}")
-                    print(f"      📄 Réponse brute : {response.text[:200]}...")
-                    # Fallback : créer une structure basique
-                    all_issues.append({
-                        "file": file_path,
-                        "issues": [
-                            {
-                                "type": "pylint",
-                                "line": 1,
-                                "description": f"Score Pylint : {pylint_score}/10",
-                                "priority": "MEDIUM",
-                                "suggestion": "Corriger les violations Pylint"
-                            }
-                        ]
-                    })
-            
-            except Exception as e:
-                print(f"      ❌ Erreur lors de l'analyse : {e}")
-                log_experiment(
-                    agent_name="Auditor_Agent",
-                    model_used="gemini-2.5-flash",
-                    action=ActionType.DEBUG,
-                    details={
-                        "file_analyzed": file_path,
-                        "input_prompt": f"Analyse de {file_path}",
-                        "output_response": f"Erreur: {str(e)}",
-                        "error": str(e)
-                    },
-                    status="FAILURE"
+                analysis = dict(cached)
+                analysis["file"] = file_path
+                return analysis
+
+            # 3. Analyse avec le LLM - seule la partie dynamique varie par fichier
+            # (extrait guidé par l'AST plutôt que troncature brute)
+            user_prompt = _USER_PROMPT_TMPL % (
+                file_name,
+                self._extract_relevant(code_content, pylint_issues),
+                pylint_score
+            )
+
+            # Appel au LLM : préfixe statique d'abord (cacheable), contenu
+            # du fichier ensuite
+            response = self.model.generate_content(
+                self._build_contents(user_prompt)
+            )
+
+            # Log obligatoire
+            log_experiment(
+                agent_name="Auditor_Agent",
+                model_used="gemini-2.5-flash",
+                action=ActionType.ANALYSIS,
+                details={
+                    "file_analyzed": file_path,
+                    "input_prompt": user_prompt[:500],
+                    "output_response": response.text[:500],
+                    "pylint_score": pylint_score,
+                    "code_length": len(code_content)
+                },
+                status="SUCCESS"
+            )
+
+            # Parser la réponse JSON
+            try:
+                clean_response = self._strip_json_fences(response.text)
+
+                # Parser le JSON puis valider la structure
+                # (orjson : parsing C, ~3-10x plus rapide que le json stdlib)
+                analysis = self._validate_analysis(
+                    orjson.loads(clean_response), file_path, pylint_score
                 )
-        
-        print(f"\n✅ Audit terminé : {len(all_issues)} fichiers analysés\n")
-        
-        return {
-            "issues": all_issues,
-            "total_files": len(files),
-            "status": "completed"
-        }
\ No newline at end of file
+
+                issues_count = len(analysis.get("issues", []))
+                print(f"      🐛 {issues_count} problèmes détectés")
+
+                self._cache[cache_key] = analysis
+                return analysis
+
+            except json.JSONDecodeError as e:
+                print(f"      ⚠️  Erreur parsing JSON : {e}")
+                print(f"      📄 Réponse brute : {response.text[:200]}...")
+                # Fallback : créer une structure basique
+                return {
+                    "file": file_path,
+                    "issues": [
+                        {
+                            "type": "pylint",
+                            "line": 1,
+                            "description": f"Score Pylint : {pylint_score}/10",
+                            "priority": "MEDIUM",
+                            "suggestion": "Corriger les violations Pylint"
+                        }
+                    ]
+                }
+
+        except Exception as e:
+            print(f"      ❌ Erreur lors de l'analyse : {e}")
+            log_experiment(
+                agent_name="Auditor_Agent",
+                model_used="gemini-2.5-flash",
+                action=ActionType.DEBUG,
+                details={
+                    "file_analyzed": file_path,
+                    "input_prompt": f"Analyse de {file_path}",
+                    "output_response": f"Erreur: {str(e)}",
+                    "error": str(e)
+                },
+                status="FAILURE"
+            )
+            return None
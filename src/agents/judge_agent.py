@@ -3,14 +3,141 @@ judge_agent.py - Agent Juge (Testeur + Validateur)
 Génère des tests ET les exécute pour valider le code
 """
 import os
-import json
 import re
-import py_compile
+import ast
+import hashlib
+import atexit
+import string
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 from google import generativeai as genai
 from src.utils.logger import log_experiment, ActionType
-from src.tools.test_runner import run_pytest_on_directory
+from src.utils.llm_cache import cached_generate
+from src.tools.test_runner import run_pytest_on_directory, run_pytest_on_directories
+
+
+# Chemin du prompt testeur, construit une fois au chargement du module
+_PROMPT_PATH = Path("src/prompts/tester_prompt.txt")
+
+# Motifs chauds précompilés une fois à l'import : évite le détour par le
+# cache interne de re (lookup + hash) à chaque fichier traité
+_FUNC_RE = re.compile(r'^def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', re.MULTILINE)
+_CLASS_RE = re.compile(r'^class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[:(]', re.MULTILINE)
+# Détection d'assertion par ligne (inclut pytest.fail) pour la
+# réparation des tests
+_LINE_ASSERT_RE = re.compile(r'assert|pytest\.(?:raises|fail)')
+# Marqueurs de troncature : '<ctrl63>', '<|endoftext|>', '<|end|>'...
+# commencent tous par l'un de ces deux préfixes
+_TRUNC_MARKERS = ('<ctrl', '<|')
+
+# Header des fichiers de test générés : gabarit construit une fois au
+# chargement, seuls le nom du module et le dossier source varient
+_HEADER_TMPL = string.Template('''"""Tests auto-générés pour ${module}.py"""
+import sys
+from pathlib import Path
+import pytest
+
+# IMPORTANT: Ajouter les dossiers nécessaires au sys.path pour les imports
+# Ajouter le dossier parent du test (ex: sandbox/)
+test_parent = Path(__file__).parent.parent
+if str(test_parent) not in sys.path:
+    sys.path.insert(0, str(test_parent))
+
+# Ajouter le dossier source du module (ex: sandbox/test_local/)
+source_dir = test_parent / "${src_dir}"
+if source_dir.exists() and str(source_dir) not in sys.path:
+    sys.path.insert(0, str(source_dir))
+
+''')
+
+# Gabarits des tests de repli, constants au niveau module : la chaîne de
+# format n'est réanalysée ni par appel ni par symbole
+_FALLBACK_FUNC_TMPL = '''
+def test_{f}_exists():
+    """Vérifie que la fonction {f} existe"""
+    assert hasattr({m}, '{f}'), "La fonction {f} doit exister"
+    assert callable(getattr({m}, '{f}')), "La fonction {f} doit être appelable"
+
+'''
+_FALLBACK_CLASS_TMPL = '''
+def test_{c}_exists():
+    """Vérifie que la classe {c} existe"""
+    assert hasattr({m}, '{c}'), "La classe {c} doit exister"
+    assert isinstance(getattr({m}, '{c}'), type), "La classe {c} doit être une classe"
+
+'''
+_FALLBACK_MODULE_TMPL = '''
+def test_module_imports():
+    """Vérifie que le module s'importe correctement"""
+    assert {m} is not None, "Le module doit s'importer correctement"
+
+'''
+
+
+@lru_cache(maxsize=32)
+def _parse_source(src: str) -> ast.Module:
+    """
+    AST partagé par chaîne de code source
+
+    Extraction des fonctions, des classes et validation syntaxique
+    consomment le même arbre : un seul parse par contenu au lieu d'un
+    scan regex + un compile() séparés.
+    """
+    return ast.parse(src)
+
+
+def _elide(s: str, n: int = 500) -> str:
+    """Tronque une chaîne pour le log ; zéro copie si déjà assez courte"""
+    return s if len(s) <= n else s[:n]
+
+
+def _has_assertion(fn_node) -> bool:
+    """Vrai si la fonction contient un assert, un raise ou pytest.raises"""
+    for sub in ast.walk(fn_node):
+        if isinstance(sub, (ast.Assert, ast.Raise)):
+            return True
+        if (isinstance(sub, ast.Call)
+                and getattr(sub.func, 'attr', None) == 'raises'):
+            return True
+    return False
+
+
+class _PlaceholderPadder(ast.NodeTransformer):
+    """Ajoute un assert placeholder aux fonctions de test sans assertion"""
+
+    def visit_FunctionDef(self, node):
+        if node.name.startswith('test_') and not _has_assertion(node):
+            node.body.append(ast.Assert(
+                test=ast.Constant(value=True),
+                msg=ast.Constant(value=f'Test {node.name} - placeholder'),
+            ))
+        return node
+
+
+def _compile_one(file_path: str):
+    """
+    Compile un fichier et retourne None ou un dict d'erreur
+
+    Fonction de module (et non méthode) pour être picklable par le
+    ProcessPoolExecutor du Gate 1.
+    """
+    try:
+        # Lecture binaire : compile() accepte les bytes et gère lui-même
+        # le cookie d'encodage, ce qui évite une passe de décodage UTF-8
+        with open(file_path, 'rb') as f:
+            code = f.read()
+        compile(code, file_path, 'exec')
+        return None
+    except SyntaxError as e:
+        return {
+            "file": file_path,
+            "line": e.lineno,
+            "error": str(e.msg),
+            "context": e.text
+        }
 
 
 class JudgeAgent:
@@ -27,29 +154,94 @@ class JudgeAgent:
             raise ValueError("GOOGLE_API_KEY non trouvée dans .env")
         
         genai.configure(api_key=api_key)
+
+        # Charger le prompt
+        self.system_prompt = self._load_system_prompt()
+
+        # Le prompt testeur part en system_instruction : préfixe stable
+        # que Gemini fingerprinte et réutilise (KV-cache serveur) au lieu
+        # d'être reconcaténé et refacturé à chaque generate_tests
         self.model = genai.GenerativeModel(
             "gemini-2.5-flash",
+            system_instruction=self.system_prompt,
             generation_config={
                 "temperature": 0.2,
                 "max_output_tokens": 10000,
             }
         )
-        
-        # Charger le prompt
-        self.system_prompt = self._load_system_prompt()
-        
+
+        # Mémoïsation du Gate 1 : (chemin, hash du contenu) -> résultat
+        # de compilation. Sur les itérations tardives où le Fixer n'a
+        # touché qu'un ou deux fichiers, seuls ceux-là sont revalidés
+        self._syntax_cache = {}
+
+        # Cache de contexte Gemini pour le prompt testeur : enregistré
+        # paresseusement au premier generate_tests (validate() n'appelle
+        # pas le LLM et ne doit pas payer l'enregistrement)
+        self._cached_content = None
+        self._cache_attempted = False
+
+
         print("✅ Juge initialisé (Gemini 2.5 Flash - Test Generator + Validator)")
     
+    # Prompts système déjà lus, partagés entre instances : une lecture
+    # disque par fichier de prompt et par processus
+    _SYSTEM_PROMPT_CACHE = {}
+
     def _load_system_prompt(self) -> str:
-        """Charge le prompt système"""
-        prompt_path = Path("src/prompts/tester_prompt.txt")
+        """Charge le prompt système (mémoïsé)"""
+        prompt_path = _PROMPT_PATH
         if not prompt_path.exists():
             # Fallback si le fichier n'existe pas
             return "You are an expert at generating comprehensive Python unit tests."
-        
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    
+
+        key = str(prompt_path)
+        cache = JudgeAgent._SYSTEM_PROMPT_CACHE
+        if key not in cache:
+            # Lecture binaire + decode : évite le décodeur de fins de
+            # ligne du mode texte
+            cache[key] = prompt_path.read_bytes().decode('utf-8')
+        return cache[key]
+
+    def _ensure_prompt_cache(self):
+        """
+        Enregistre le prompt testeur comme CachedContent Gemini
+
+        Tenté une seule fois, au premier generate_tests : le préfixe
+        statique est alors facturé au tarif cache sur tous les appels
+        suivants au lieu d'être renvoyé en entier à chaque fichier. En
+        cas d'échec (API indisponible, préfixe trop court, quota...), on
+        continue avec le prompt envoyé inline.
+        """
+        if self._cache_attempted:
+            return
+        self._cache_attempted = True
+        try:
+            self._cached_content = genai.caching.CachedContent.create(
+                model="models/gemini-2.5-flash",
+                system_instruction=self.system_prompt,
+                ttl=datetime.timedelta(hours=1),
+            )
+            self.model = genai.GenerativeModel.from_cached_content(
+                self._cached_content,
+                generation_config={
+                    "temperature": 0.2,
+                    "max_output_tokens": 10000,
+                }
+            )
+            atexit.register(self._delete_prompt_cache)
+        except Exception:
+            self._cached_content = None
+
+    def _delete_prompt_cache(self):
+        """Supprime le CachedContent côté serveur à la fin du run"""
+        if self._cached_content is not None:
+            try:
+                self._cached_content.delete()
+            except Exception:
+                pass
+            self._cached_content = None
+
     # ========================================
     # PARTIE 1: GÉNÉRATION DE TESTS
     # ========================================
@@ -66,11 +258,42 @@ class JudgeAgent:
             Chemin du fichier de test généré
         """
         try:
-            file_name = Path(file_path).stem
-            
-            # Lire le code source
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            # Un seul objet Path par fichier, réutilisé pour le stem et
+            # la lecture
+            source_path = Path(file_path)
+            file_name = source_path.stem
+            test_file = target_directory / "tests" / f"test_{file_name}.py"
+
+            # Si le fichier de test existe déjà et est plus récent que
+            # la source, la régénération (prompt + LLM + validation)
+            # serait identique : on garde le fichier en place
+            try:
+                test_mtime = test_file.stat().st_mtime
+                source_mtime = source_path.stat().st_mtime
+                if test_mtime >= source_mtime:
+                    print(f"      ⚡ Tests à jour pour {file_name}.py (régénération sautée)")
+                    # Log obligatoire : le court-circuit doit laisser une
+                    # trace dans le log d'expérience, comme côté Auditeur
+                    log_experiment(
+                        agent_name="Judge_Agent",
+                        model_used="N/A (Deterministic)",
+                        action=ActionType.GENERATION,
+                        details={
+                            "input_prompt": f"Génération de tests pour {file_path}",
+                            "output_response": "Tests à jour, régénération sautée",
+                            "file_tested": file_path,
+                            "test_file_generated": str(test_file),
+                            "test_mtime": test_mtime,
+                            "source_mtime": source_mtime
+                        },
+                        status="SKIPPED_FRESH"
+                    )
+                    return str(test_file)
+            except OSError:
+                pass
+
+            # Lire le code source (lecture binaire + decode)
+            source_code = source_path.read_bytes().decode('utf-8')
             
             # Extraire les fonctions
             functions = self._extract_functions(source_code)
@@ -114,13 +337,13 @@ import {file_name}
 
 """
             
-            # Appel LLM
-            response = self.model.generate_content(
-                f"{self.system_prompt}\n\n{user_prompt}"
-            )
-            
-            # Extraire le code de test
-            response_text = self._extract_text_from_response(response)
+            # Appel LLM : le prompt testeur vit dans le system_instruction
+            # du modèle (ou en CachedContent serveur), seule la partie
+            # dynamique part sur le réseau. L'appel passe par le cache
+            # disque : un fichier rejoué à l'identique d'une itération à
+            # l'autre ne refait pas l'aller-retour Gemini
+            self._ensure_prompt_cache()
+            response_text = cached_generate(self.model, user_prompt)
             test_code = self._clean_test_response(response_text)
             
             # NOUVEAU: Valider et corriger le code de test
@@ -130,18 +353,16 @@ import {file_name}
             test_dir = target_directory / "tests"
             test_dir.mkdir(exist_ok=True)
             
-            # Créer __init__.py pour que pytest fonctionne
-            init_file = test_dir / "__init__.py"
-            if not init_file.exists():
-                init_file.write_text("")
-            
-            # Fichier de test
-            test_file = test_dir / f"test_{file_name}.py"
-            
+            # Créer __init__.py pour que pytest fonctionne (touch :
+            # un seul openat au lieu de exists() + open/write/close)
+            (test_dir / "__init__.py").touch(exist_ok=True)
+
             # Préparer le code final
             final_test_code = self._prepare_test_file(test_code, file_name, file_path)
-            
-            test_file.write_text(final_test_code, encoding='utf-8')
+
+            # Encodage une seule fois + write_bytes : un write() kernel
+            # sans TextIOWrapper intermédiaire
+            test_file.write_bytes(final_test_code.encode('utf-8'))
             
             # Log
             log_experiment(
@@ -149,8 +370,8 @@ import {file_name}
                 model_used="gemini-2.5-flash",
                 action=ActionType.GENERATION,
                 details={
-                    "input_prompt": user_prompt[:500],
-                    "output_response": response_text[:500],
+                    "input_prompt": _elide(user_prompt),
+                    "output_response": _elide(response_text),
                     "file_tested": file_path,
                     "test_file_generated": str(test_file),
                     "functions_found": functions,
@@ -196,9 +417,9 @@ import {file_name}
         """
         print(f"      🔍 Validation du code de test généré...")
         
-        # 1. Vérifier la syntaxe Python
+        # 1. Vérifier la syntaxe Python (AST partagé avec les extracteurs)
         try:
-            compile(test_code, '<test_code>', 'exec')
+            _parse_source(test_code)
         except SyntaxError as e:
             print(f"      ⚠️ Erreur de syntaxe détectée, tentative de correction...")
             test_code = self._fix_syntax_errors(test_code)
@@ -218,70 +439,102 @@ import {file_name}
         """Tente de corriger les erreurs de syntaxe courantes"""
         # Supprimer les lignes incomplètes à la fin
         lines = test_code.split('\n')
-        
-        # Trouver la dernière ligne avec du contenu significatif
+
+        # Trouver la dernière ligne avec du contenu significatif : scan
+        # arrière avec un seul strip par ligne
         last_valid_index = len(lines) - 1
         for i in range(len(lines) - 1, -1, -1):
             line = lines[i].strip()
             # Ignorer les lignes vides et les commentaires incomplets
-            if line and not line.startswith('#') and not line.endswith('...') and line != 'pass':
-                # Vérifier si c'est une ligne complète
-                if not line.endswith((':' , '\\', ',')):
-                    last_valid_index = i
-                    break
-        
+            if (line and line[0] != '#' and line != 'pass'
+                    and not line.endswith(('...', ':', '\\', ','))):
+                last_valid_index = i
+                break
+
         # Garder seulement jusqu'à la dernière ligne valide
-        fixed_lines = lines[:last_valid_index + 1]
-        
-        return '\n'.join(fixed_lines)
+        return '\n'.join(lines[:last_valid_index + 1])
     
-    def _ensure_complete_tests(self, test_code: str, module_name: str, 
+    def _ensure_complete_tests(self, test_code: str, module_name: str,
                                functions: List[str], classes: List[str]) -> str:
         """S'assure que tous les tests sont complets avec des assertions"""
+        # Travail sur l'arbre plutôt que suivi d'indentation ligne à
+        # ligne : pas de faux positifs sur les docstrings et plus aucun
+        # bookkeeping textuel. Repli sur la passe ligne à ligne quand le
+        # code ne parse pas
+        try:
+            tree = _parse_source(test_code)
+        except SyntaxError:
+            return self._ensure_complete_tests_lines(test_code)
+
+        # ast.walk : couvre aussi les tests définis dans des classes,
+        # que le NodeTransformer visitera de toute façon
+        needs_padding = any(
+            isinstance(node, ast.FunctionDef)
+            and node.name.startswith('test_')
+            and not _has_assertion(node)
+            for node in ast.walk(tree)
+        )
+        if not needs_padding:
+            return test_code
+
+        # Re-parse frais : l'arbre de _parse_source est partagé via
+        # lru_cache et ne doit pas être muté
+        tree = _PlaceholderPadder().visit(ast.parse(test_code))
+        ast.fix_missing_locations(tree)
+        return ast.unparse(tree)
+
+    def _ensure_complete_tests_lines(self, test_code: str) -> str:
+        """Réparation textuelle des tests (repli si le code ne parse pas)"""
         lines = test_code.split('\n')
         fixed_lines = []
         in_test_function = False
         test_function_name = ""
         test_has_assertion = False
         test_indent = ""
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
+
+        # Une seule passe, un seul lstrip par ligne : l'indentation et la
+        # version nettoyée sont dérivées ensemble au lieu d'être
+        # recalculées à chaque test de préfixe
+        placeholders = ('pass', '...', 'pass  # TODO', '# TODO')
+
+        for line in lines:
+            lstripped = line.lstrip()
+            indent = line[:len(line) - len(lstripped)]
+            stripped = lstripped.rstrip()
+
             # Détecter le début d'une fonction de test
             if stripped.startswith('def test_'):
                 # Si la fonction précédente n'avait pas d'assertion, l'ajouter
                 if in_test_function and not test_has_assertion:
                     fixed_lines.append(f"{test_indent}    assert True, 'Test {test_function_name} - placeholder'")
-                
+
                 in_test_function = True
                 test_function_name = stripped.split('(')[0].replace('def ', '')
                 test_has_assertion = False
-                test_indent = line[:len(line) - len(line.lstrip())]
+                test_indent = indent
                 fixed_lines.append(line)
                 continue
-            
+
             # Détecter les assertions
             if in_test_function:
-                if 'assert' in stripped or 'pytest.raises' in stripped or 'pytest.fail' in stripped:
+                if _LINE_ASSERT_RE.search(stripped):
                     test_has_assertion = True
-                
+
                 # Détecter la fin de la fonction (nouvelle fonction ou fin de fichier)
-                if (stripped.startswith('def ') and not stripped.startswith('def test_')) or \
-                   (stripped.startswith('class ')):
+                if ((stripped.startswith('def ') and not stripped.startswith('def test_'))
+                        or stripped.startswith('class ')):
                     if not test_has_assertion:
                         fixed_lines.append(f"{test_indent}    assert True, 'Test {test_function_name} - placeholder'")
                     in_test_function = False
-                
+
                 # Supprimer les placeholders inutiles
-                if stripped in ['pass', '...', 'pass  # TODO', '# TODO']:
+                if stripped in placeholders:
                     if not test_has_assertion:
                         # Remplacer par une assertion minimale
-                        indent = line[:len(line) - len(line.lstrip())]
                         fixed_lines.append(f"{indent}assert True, 'Test {test_function_name} - needs implementation'")
                         test_has_assertion = True
                     continue
-            
+
             fixed_lines.append(line)
         
         # Vérifier la dernière fonction
@@ -292,54 +545,48 @@ import {file_name}
     
     def _has_valid_tests(self, test_code: str) -> bool:
         """Vérifie si le code contient au moins un test valide"""
-        # Chercher les fonctions de test
-        test_pattern = r'def\s+test_\w+\s*\([^)]*\):'
-        test_matches = re.findall(test_pattern, test_code)
-        
-        if not test_matches:
+        # Contrôle sur l'arbre (partagé via _parse_source : le code n'a
+        # en général pas changé depuis le contrôle de syntaxe, donc zéro
+        # re-parse) : pas de faux positif sur un 'assert' dans une
+        # docstring ou un commentaire
+        try:
+            tree = _parse_source(test_code)
+        except SyntaxError:
             return False
-        
-        # Vérifier qu'au moins un test a une assertion
-        has_assertion = bool(re.search(r'\bassert\b', test_code)) or \
-                       bool(re.search(r'pytest\.raises', test_code))
-        
-        return has_assertion
+
+        # ast.walk : les méthodes de test dans une classe (class TestX:
+        # def test_...) comptent aussi, pas seulement le niveau module
+        return any(
+            isinstance(node, ast.FunctionDef)
+            and node.name.startswith('test_')
+            and _has_assertion(node)
+            for node in ast.walk(tree)
+        )
     
     def _generate_fallback_tests(self, module_name: str, functions: List[str], 
                                  classes: List[str]) -> str:
         """Génère des tests par défaut si le LLM a échoué"""
-        test_code = f"# Fallback tests générés automatiquement\n\n"
-        
+        # Accumulation en liste + join : O(N) quel que soit le nombre de
+        # symboles, là où += sur str réalloue à chaque concaténation
+        parts = ["# Fallback tests générés automatiquement\n\n"]
+
         # Tests pour les fonctions
-        for func in functions:
-            test_code += f"""
-def test_{func}_exists():
-    \"\"\"Vérifie que la fonction {func} existe\"\"\"
-    assert hasattr({module_name}, '{func}'), "La fonction {func} doit exister"
-    assert callable(getattr({module_name}, '{func}')), "La fonction {func} doit être appelable"
+        parts.extend(
+            _FALLBACK_FUNC_TMPL.format(m=module_name, f=func)
+            for func in functions
+        )
 
-"""
-        
         # Tests pour les classes
-        for cls in classes:
-            test_code += f"""
-def test_{cls}_exists():
-    \"\"\"Vérifie que la classe {cls} existe\"\"\"
-    assert hasattr({module_name}, '{cls}'), "La classe {cls} doit exister"
-    assert isinstance(getattr({module_name}, '{cls}'), type), "La classe {cls} doit être une classe"
+        parts.extend(
+            _FALLBACK_CLASS_TMPL.format(m=module_name, c=cls)
+            for cls in classes
+        )
 
-"""
-        
         # Si aucune fonction ou classe, ajouter un test minimal
         if not functions and not classes:
-            test_code += f"""
-def test_module_imports():
-    \"\"\"Vérifie que le module s'importe correctement\"\"\"
-    assert {module_name} is not None, "Le module doit s'importer correctement"
+            parts.append(_FALLBACK_MODULE_TMPL.format(m=module_name))
 
-"""
-        
-        return test_code
+        return ''.join(parts)
     
     # ========================================
     # PARTIE 2: VALIDATION / EXÉCUTION DES TESTS
@@ -364,23 +611,8 @@ def test_module_imports():
         # GATE 1: Validation syntaxe
         # ========================================
         print("   🔍 Gate 1: Validation de la syntaxe...")
-        syntax_errors = []
-        
-        for file_path in files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
-                compile(code, file_path, 'exec')
-                print(f"      ✅ {Path(file_path).name}: Syntaxe valide")
-            except SyntaxError as e:
-                syntax_errors.append({
-                    "file": file_path,
-                    "line": e.lineno,
-                    "error": str(e.msg),
-                    "context": e.text
-                })
-                print(f"      ❌ {Path(file_path).name}: Erreur ligne {e.lineno}")
-        
+        syntax_errors = self._run_syntax_check(files)
+
         if syntax_errors:
             print("   ❌ Gate 1 failed: Erreurs de syntaxe détectées\n")
             return {
@@ -410,16 +642,25 @@ def test_module_imports():
                 "warnings": ["Aucun test disponible"]
             }
         
-        # Exécuter les tests de TOUS les répertoires
+        # Exécuter les tests de TOUS les répertoires. Plusieurs
+        # répertoires partent dans une seule invocation pytest : un seul
+        # démarrage d'interpréteur + chargement des plugins au lieu d'un
+        # par répertoire, et le rapport JSON agrège tout
         all_passed = 0
         all_failed = 0
         all_total = 0
         all_error_logs = []
-        
-        for test_dir in test_dirs:
-            print(f"\n   🔬 Exécution des tests dans {test_dir}...")
-            test_results = run_pytest_on_directory(str(test_dir))
-            
+
+        if len(test_dirs) > 1:
+            print(f"\n   🔬 Exécution groupée des tests ({len(test_dirs)} répertoires)...")
+            all_results = [run_pytest_on_directories([str(d) for d in test_dirs])]
+            result_dirs = [Path(target_directory)]
+        else:
+            print(f"\n   🔬 Exécution des tests dans {test_dirs[0]}...")
+            all_results = [run_pytest_on_directory(str(test_dirs[0]))]
+            result_dirs = [test_dirs[0]]
+
+        for test_dir, test_results in zip(result_dirs, all_results):
             passed = test_results.get("passed_count", 0)
             failed = test_results.get("failed_count", 0)
             total = test_results.get("total_count", 0)
@@ -435,6 +676,7 @@ def test_module_imports():
                 for error in test_results.get("error_logs", []):
                     error_detail = {
                         "test": error.get("test", "unknown"),
+                        "test_full_path": error.get("test_full_path", ""),
                         "message": error.get("message", ""),
                         "traceback": error.get("traceback", ""),
                         "test_dir": str(test_dir)
@@ -489,101 +731,140 @@ def test_module_imports():
     # ========================================
     # MÉTHODES UTILITAIRES
     # ========================================
-    
+
+    def _run_syntax_check(self, files: List[str]) -> List[Dict]:
+        """
+        Gate 1 : compile chaque fichier et retourne la liste des erreurs
+
+        Tâche purement CPU et indépendante par fichier : au-delà de
+        quelques fichiers elle est répartie sur les cœurs ; en dessous,
+        le coût de démarrage des workers ne vaut pas le gain et on
+        reste séquentiel. Les fichiers inchangés depuis la dernière
+        itération (même hash de contenu) réutilisent le résultat
+        mémoïsé sans recompiler.
+        """
+        # Hash du contenu : détermine quels fichiers doivent vraiment
+        # être recompilés
+        cache_keys = {}
+        pending = []
+        for file_path in files:
+            try:
+                digest = hashlib.sha1(Path(file_path).read_bytes()).hexdigest()
+                cache_keys[file_path] = (file_path, digest)
+            except OSError:
+                cache_keys[file_path] = None
+            key = cache_keys[file_path]
+            if key is None or key not in self._syntax_cache:
+                pending.append(file_path)
+
+        if len(pending) > 4:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                computed = list(pool.map(_compile_one, pending))
+        else:
+            computed = [_compile_one(f) for f in pending]
+
+        results = {}
+        for file_path, result in zip(pending, computed):
+            results[file_path] = result
+            key = cache_keys[file_path]
+            if key is not None:
+                self._syntax_cache[key] = result
+
+        syntax_errors = []
+        for file_path in files:
+            if file_path in results:
+                result = results[file_path]
+            else:
+                result = self._syntax_cache[cache_keys[file_path]]
+            name = Path(file_path).name
+            if result is None:
+                print(f"      ✅ {name}: Syntaxe valide")
+            else:
+                syntax_errors.append(result)
+                print(f"      ❌ {name}: Erreur ligne {result['line']}")
+
+        return syntax_errors
+
     def _find_test_directories(self, target_directory: Path) -> List[Path]:
-        """Trouve tous les répertoires de tests à exécuter"""
+        """
+        Trouve tous les répertoires de tests à exécuter
+
+        Un seul glob par candidat : la même liste sert au test de
+        présence, à la déduplication et au comptage affiché, au lieu
+        d'un scan disque séparé par usage.
+        """
+        # Candidats, dans l'ordre : tests/ racine, target/tests/, src/tests/
+        candidates = [
+            Path("tests"),
+            target_directory / "tests",
+            Path("src/tests"),
+        ]
+
         test_dirs = []
         checked_paths = set()
-        
-        # 1. Tests dans le répertoire racine tests/
-        root_tests = Path("tests")
-        if root_tests.exists() and list(root_tests.glob("test_*.py")):
-            resolved_path = root_tests.resolve()
-            test_dirs.append(root_tests)
+
+        for candidate in candidates:
+            if not candidate.exists():
+                continue
+            test_files = list(candidate.glob("test_*.py"))
+            if not test_files:
+                continue
+            resolved_path = candidate.resolve()
+            if resolved_path in checked_paths:
+                continue
+            test_dirs.append(candidate)
             checked_paths.add(resolved_path)
-            print(f"   📁 Détecté: {root_tests} ({len(list(root_tests.glob('test_*.py')))} fichiers)")
-        
-        # 2. Tests dans target_directory/tests/ (ex: sandbox/tests/)
-        target_tests = target_directory / "tests"
-        if target_tests.exists() and list(target_tests.glob("test_*.py")):
-            resolved_path = target_tests.resolve()
-            if resolved_path not in checked_paths:
-                test_dirs.append(target_tests)
-                checked_paths.add(resolved_path)
-                print(f"   📁 Détecté: {target_tests} ({len(list(target_tests.glob('test_*.py')))} fichiers)")
-        
-        # 3. Tests dans src/tests/ (si existe)
-        src_tests = Path("src/tests")
-        if src_tests.exists() and list(src_tests.glob("test_*.py")):
-            resolved_path = src_tests.resolve()
-            if resolved_path not in checked_paths:
-                test_dirs.append(src_tests)
-                checked_paths.add(resolved_path)
-                print(f"   📁 Détecté: {src_tests} ({len(list(src_tests.glob('test_*.py')))} fichiers)")
-        
+            print(f"   📁 Détecté: {candidate} ({len(test_files)} fichiers)")
+
         return test_dirs
     
-    def _extract_text_from_response(self, response) -> str:
-        """Extrait le texte de la réponse Gemini"""
-        try:
-            return response.text
-        except (ValueError, AttributeError):
-            text_parts = []
-            
-            if hasattr(response, 'candidates'):
-                for candidate in response.candidates:
-                    if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                        for part in candidate.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                text_parts.append(part.text)
-            
-            if not text_parts and hasattr(response, 'parts'):
-                for part in response.parts:
-                    if hasattr(part, 'text') and part.text:
-                        text_parts.append(part.text)
-            
-            if not text_parts:
-                raise ValueError("No text content in response")
-            
-            return '\n'.join(text_parts)
-    
     def _extract_functions(self, code: str) -> list:
-        """Extrait les noms des fonctions"""
-        pattern = r'^def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('
-        matches = re.findall(pattern, code, re.MULTILINE)
-        return [m for m in matches if not m.startswith('_')]
-    
+        """Extrait les noms des fonctions (AST, sans faux positifs dans les chaînes)"""
+        try:
+            tree = _parse_source(code)
+        except SyntaxError:
+            # Code source buggé non parsable : repli sur le scan regex
+            return [m for m in _FUNC_RE.findall(code) if not m.startswith('_')]
+        return [
+            node.name for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and not node.name.startswith('_')
+        ]
+
     def _extract_classes(self, code: str) -> list:
-        """Extrait les noms des classes"""
-        pattern = r'^class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[:(]'
-        return re.findall(pattern, code, re.MULTILINE)
+        """Extrait les noms des classes (même arbre que _extract_functions)"""
+        try:
+            tree = _parse_source(code)
+        except SyntaxError:
+            return _CLASS_RE.findall(code)
+        return [
+            node.name for node in tree.body
+            if isinstance(node, ast.ClassDef)
+        ]
     
     def _clean_test_response(self, response_text: str) -> str:
         """Nettoie la réponse pour extraire le code"""
         cleaned = response_text.strip()
-        
-        # Enlever markdown
+
+        # Enlever markdown : les fences sont des littéraux fixes, un
+        # split C-level suffit (pas de regex)
         if "```python" in cleaned:
-            match = re.search(r'```python\s*\n(.*?)```', cleaned, re.DOTALL)
-            if match:
-                cleaned = match.group(1)
+            cleaned = cleaned.split('```python', 1)[1].split('```', 1)[0]
         elif "```" in cleaned:
-            match = re.search(r'```\s*\n(.*?)```', cleaned, re.DOTALL)
-            if match:
-                cleaned = match.group(1)
-        
+            cleaned = cleaned.split('```', 1)[1].split('```', 1)[0]
+
         cleaned = cleaned.strip()
-        
+
         # Remove any trailing markdown backticks that weren't caught
         while cleaned.endswith('```'):
             cleaned = cleaned[:-3].rstrip()
-        
-        # Remove common truncation markers and everything after them
-        truncation_markers = ['<ctrl63>', '<|endoftext|>', '<|end|>', '<ctrl', '<|']
-        for marker in truncation_markers:
-            if marker in cleaned:
-                cleaned = cleaned[:cleaned.index(marker)].rstrip()
-        
+
+        # Marqueurs de troncature : une seule coupe au premier trouvé
+        cut = min((i for i in (cleaned.find(m) for m in _TRUNC_MARKERS)
+                   if i >= 0), default=-1)
+        if cut >= 0:
+            cleaned = cleaned[:cut].rstrip()
+
         return cleaned
     
     def _prepare_test_file(self, test_code: str, module_name: str, module_path: str) -> str:
@@ -591,24 +872,11 @@ def test_module_imports():
         source_file = Path(module_path)
         source_dir = source_file.parent
         
-        # Construire le header avec les imports corrects
-        header = f'''"""Tests auto-générés pour {module_name}.py"""
-import sys
-from pathlib import Path
-import pytest
-
-# IMPORTANT: Ajouter les dossiers nécessaires au sys.path pour les imports
-# Ajouter le dossier parent du test (ex: sandbox/)
-test_parent = Path(__file__).parent.parent
-if str(test_parent) not in sys.path:
-    sys.path.insert(0, str(test_parent))
-
-# Ajouter le dossier source du module (ex: sandbox/test_local/)
-source_dir = test_parent / "{source_dir.name}"
-if source_dir.exists() and str(source_dir) not in sys.path:
-    sys.path.insert(0, str(source_dir))
-
-'''
+        # Construire le header avec les imports corrects (gabarit
+        # module-level : seules les deux variables sont substituées)
+        header = _HEADER_TMPL.substitute(
+            module=module_name, src_dir=source_dir.name
+        )
         
         # Déterminer le chemin d'import correct
         if source_dir.name == "test_local":
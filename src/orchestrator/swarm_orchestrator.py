@@ -5,6 +5,8 @@ VERSION FIXÉE - Le Juge génère ET exécute les tests
 VERSION MODIFIÉE - Succès si au moins 80% des tests passent
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
@@ -16,6 +18,18 @@ from src.tools.file_manager import list_python_files, backup_file
 from src.utils.logger import log_experiment, ActionType
 
 
+# Composants de chemin mémoïsés : les mêmes chaînes reviennent à chaque
+# itération, inutile de réallouer un PurePath à chaque passage
+@lru_cache(maxsize=4096)
+def _path_stem(p: str) -> str:
+    return Path(p).stem
+
+
+@lru_cache(maxsize=4096)
+def _path_name(p: str) -> str:
+    return Path(p).name
+
+
 class RefactoringSwarm:
     """
     Orchestrateur principal du système de refactoring
@@ -29,19 +43,31 @@ class RefactoringSwarm:
     
     # Success threshold: minimum percentage of tests that must pass
     SUCCESS_THRESHOLD = 0.80  # 80% of tests must pass for success
+
+    # Nombre maximum de générations de tests simultanées (borne la
+    # concurrence vis-à-vis du fournisseur LLM)
+    MAX_CONCURRENT_TESTGEN = 5
     
-    def __init__(self, target_directory: Path, max_iterations: int = 3, success_threshold: float = None):
+    def __init__(self, target_directory: Path, max_iterations: int = 3,
+                 success_threshold: float = None,
+                 clean_score_threshold: float = None):
         """
         Initialise l'orchestrateur
-        
+
         Args:
             target_directory: Dossier contenant le code à refactorer
             max_iterations: Nombre maximum d'itérations de self-healing
             success_threshold: Seuil de réussite (0.0 à 1.0). Si None, utilise SUCCESS_THRESHOLD
+            clean_score_threshold: Score pylint à partir duquel l'Auditeur
+                considère un fichier propre et saute l'appel LLM
         """
         self.target_directory = Path(target_directory)
         self.max_iterations = max_iterations
         self.current_iteration = 0
+
+        # Liste des fichiers découverts, mémoïsée pour la durée du run :
+        # un seul parcours disque même si plusieurs phases la demandent
+        self._files_cache = None
         
         # Configurer le seuil de succès
         if success_threshold is not None:
@@ -53,7 +79,11 @@ class RefactoringSwarm:
         
         # Initialiser les agents
         print("🔧 Initialisation des agents...")
-        self.auditor = AuditorAgent()
+        # Ne transmettre le seuil que s'il est explicitement fourni
+        auditor_kwargs = {}
+        if clean_score_threshold is not None:
+            auditor_kwargs["clean_score_threshold"] = clean_score_threshold
+        self.auditor = AuditorAgent(**auditor_kwargs)
         self.fixer = FixerAgent()
         self.judge = JudgeAgent()  # Juge = Génère tests + Exécute tests
         
@@ -61,8 +91,10 @@ class RefactoringSwarm:
         print(f"📊 Seuil de succès configuré : {self.success_threshold * 100:.0f}% des tests doivent passer\n")
     
     def _discover_files(self) -> List[str]:
-        """Découvre les fichiers Python à traiter"""
-        files = list_python_files(str(self.target_directory))
+        """Découvre les fichiers Python à traiter (mémoïsé par run)"""
+        if self._files_cache is None:
+            self._files_cache = list_python_files(str(self.target_directory))
+        files = self._files_cache
         print(f"📦 {len(files)} fichiers Python détectés\n")
         return files
     
@@ -108,15 +140,27 @@ class RefactoringSwarm:
         print("   🧠 Analyse du code pour comprendre la logique métier...")
         print("   📝 Génération de tests par le Juge...")
         
-        test_files = []
-        for file_path in files:
-            # Le JUGE génère les tests (pas un agent séparé)
-            test_file = self.judge.generate_tests(file_path, self.target_directory)
-            if test_file:
-                test_files.append(test_file)
+        # Le JUGE génère les tests (pas un agent séparé). Chaque fichier
+        # est un appel LLM indépendant : fan-out sur un pool borné au
+        # lieu de payer N * T_llm en séquentiel
+        if len(files) > 1:
+            workers = min(self.MAX_CONCURRENT_TESTGEN, len(files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda fp: self.judge.generate_tests(
+                        fp, self.target_directory
+                    ),
+                    files
+                ))
+        else:
+            results = [
+                self.judge.generate_tests(files[0], self.target_directory)
+            ]
+
+        test_files = [t for t in results if t]
         
         if test_files:
-            print(f"      ✅ Tests générés: {', '.join([Path(f).name for f in test_files])}")
+            print(f"      ✅ Tests générés: {', '.join([_path_name(f) for f in test_files])}")
         
         print(f"   ✅ {len(test_files)} fichiers de tests créés")
         
@@ -136,8 +180,11 @@ class RefactoringSwarm:
         
         result = self.fixer.fix(plan, error_logs)
         
-        print(f"\n   ✅ {len(result['files_modified'])} fichiers modifiés")
-        print(f"   🐛 {result['bugs_fixed']} corrections appliquées")
+        # Accès défensifs (.get) : cohérent avec les autres lecteurs du
+        # résultat et pas de KeyError si le Fixer retourne un résultat
+        # partiel
+        print(f"\n   ✅ {len(result.get('files_modified', []))} fichiers modifiés")
+        print(f"   🐛 {result.get('bugs_fixed', 0)} corrections appliquées")
         
         return result
     
@@ -153,42 +200,68 @@ class RefactoringSwarm:
         
         return validation_result
     
-    def _evaluate_success(self, validation_result: Dict) -> tuple[bool, str]:
+    def _evaluate_success(self, validation_result: Dict) -> tuple[bool, bool, str]:
         """
         Évalue si le refactoring est réussi selon le seuil configuré
-        
+
         Args:
             validation_result: Résultats de validation du Juge
-            
+
         Returns:
-            Tuple (success: bool, reason: str)
+            Tuple (success: bool, perfect: bool, reason: str). `perfect`
+            signifie que TOUS les tests passent (arrêt immédiat possible)
         """
         # Si le Juge a détecté des erreurs de syntaxe, échec automatique
         gate_failed = validation_result.get("gate_failed", None)
         if gate_failed == "syntax":
-            return False, "Erreurs de syntaxe détectées"
-        
+            return False, False, "Erreurs de syntaxe détectées"
+
         # Calculer le pourcentage de tests réussis
         tests_passed = validation_result.get("tests_passed", 0)
         tests_total = validation_result.get("tests_total", 0)
-        
+
         # Cas où aucun test n'existe (traiter comme un avertissement, pas un échec)
         if tests_total == 0:
             print("   ⚠️  AVERTISSEMENT: Aucun test disponible pour valider le code")
-            return True, "Aucun test disponible (validation impossible)"
-        
+            return True, False, "Aucun test disponible (validation impossible)"
+
+        # Score parfait : inutile de calculer le taux et le seuil
+        if tests_passed == tests_total:
+            return True, True, "Tous les tests ont été validés avant la limite d'itérations"
+
         # Calculer le taux de réussite
         success_rate = tests_passed / tests_total
-        
+
         print(f"\n   📊 Taux de réussite: {success_rate * 100:.1f}% ({tests_passed}/{tests_total} tests)")
         print(f"   🎯 Seuil requis: {self.success_threshold * 100:.0f}%")
-        
+
         # Vérifier si on atteint le seuil
         if success_rate >= self.success_threshold:
-            return True, f"{success_rate * 100:.1f}% des tests passent (>= {self.success_threshold * 100:.0f}% requis)"
+            return True, False, f"{success_rate * 100:.1f}% des tests passent (>= {self.success_threshold * 100:.0f}% requis)"
         else:
             tests_needed = int(self.success_threshold * tests_total) - tests_passed
-            return False, f"Seulement {success_rate * 100:.1f}% des tests passent, {tests_needed} test(s) de plus nécessaire(s)"
+            return False, False, f"Seulement {success_rate * 100:.1f}% des tests passent, {tests_needed} test(s) de plus nécessaire(s)"
+
+    def _build_report(self, success: bool, reason: str, iterations_used: int,
+                      files_count: int, bugs_fixed: int, tests_passed: int,
+                      tests_total: int) -> Dict:
+        """Construit le rapport final (un seul littéral au lieu de trois)"""
+        report = {
+            "success": success,
+            "iterations_used": iterations_used,
+            "files_processed": files_count,
+            "bugs_fixed": bugs_fixed,
+            "tests_passed": tests_passed,
+            "total_tests": tests_total,
+            "success_rate": (tests_passed / tests_total) if tests_total > 0 else 0.0,
+            "threshold": self.success_threshold,
+            "output_directory": str(self.target_directory),
+        }
+        if success:
+            report["reason"] = reason
+        else:
+            report["error"] = reason
+        return report
     
     def _self_healing_iteration(self, plan: Dict, validation_result: Dict) -> Dict:
         """
@@ -216,10 +289,33 @@ class RefactoringSwarm:
         
         # Récupérer les erreurs pour informer le Fixer
         error_logs = validation_result.get("errors", [])
-        
+
+        # Restreindre le plan aux fichiers dont les tests échouent : les
+        # fichiers déjà validés par le Juge n'ont pas besoin de repasser
+        # par le Fixer (ni par le LLM). Le module source se déduit du
+        # nodeid pytest (tests/test_<module>.py::test_x)
+        failed_modules = set()
+        for error in error_logs:
+            if not isinstance(error, dict):
+                continue
+            nodeid = error.get("test_full_path", "")
+            test_stem = _path_stem(nodeid.split("::")[0])
+            if test_stem.startswith("test_"):
+                failed_modules.add(test_stem[len("test_"):])
+
+        issues = plan.get("issues", [])
+        if failed_modules:
+            filtered = [
+                f for f in issues
+                if _path_stem(f.get("file", "")) in failed_modules
+            ]
+            if filtered and len(filtered) < len(issues):
+                print(f"             🎯 Correction restreinte à {len(filtered)} fichier(s) en échec sur {len(issues)}")
+                plan = {**plan, "issues": filtered}
+
         # Réappliquer les corrections avec le contexte d'erreur
         fix_result = self._phase_fix(plan, error_logs)
-        
+
         return fix_result
     
     def run(self) -> Dict:
@@ -248,19 +344,35 @@ class RefactoringSwarm:
                 "threshold": self.success_threshold
             }
         
-        # Sauvegarder les fichiers originaux
+        # Sauvegarde des fichiers originaux en tâche de fond : l'audit
+        # et la génération de tests ne font que lire les sources, seules
+        # les écritures du Fixer (phase 3) doivent attendre les copies
         print("💾 Sauvegarde des fichiers originaux...")
-        for file_path in files:
+        backup_pool = ThreadPoolExecutor(max_workers=2)
+        backup_futures = {
+            backup_pool.submit(backup_file, fp): fp for fp in files
+        }
+
+        # Phases 1 et 2 en parallèle : l'audit et la génération des
+        # tests ne dépendent que de la liste de fichiers (l'un lit le
+        # code, l'autre écrit dans tests/), donc le mur d'attente passe
+        # de T_audit + T_testgen à max(T_audit, T_testgen)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            audit_future = executor.submit(self._phase_audit, files)
+            test_gen_future = executor.submit(
+                self._phase_test_generation, files
+            )
+            plan = audit_future.result()
+            test_gen_result = test_gen_future.result()
+
+        # Barrière avant toute modification : les backups doivent être
+        # terminés avant que le Fixer ne touche aux fichiers
+        for future, file_path in backup_futures.items():
             try:
-                backup_file(file_path)
+                future.result()
             except Exception as e:
                 print(f"   ⚠️  Impossible de sauvegarder {file_path}: {e}")
-        
-        # Phase 1: Audit initial
-        plan = self._phase_audit(files)
-        
-        # Phase 2: Génération des tests (par le Juge)
-        test_gen_result = self._phase_test_generation(files)
+        backup_pool.shutdown()
         
         total_bugs_fixed = 0
         last_validation = None
@@ -286,82 +398,43 @@ class RefactoringSwarm:
             validation_result = self._phase_validation(files)
             last_validation = validation_result
             
-           
-            # Calculer les métriques finales
+            # Évaluation unique : succès, perfection et raison en un
+            # seul passage (plus de taux recalculé dans deux branches)
             tests_passed = validation_result.get("tests_passed", 0)
             tests_total = validation_result.get("tests_total", 0)
-            success_rate = (tests_passed / tests_total) if tests_total > 0 else 0.0
-            
-                # Succès immédiat si TOUS les tests passent
-            if tests_total > 0 and tests_passed == tests_total:
+            success, perfect, reason = self._evaluate_success(validation_result)
+
+            # Succès immédiat si TOUS les tests passent
+            if perfect:
                 print("\n" + "=" * 70)
                 print("                ✅ SUCCÈS - Tous les tests réussis!")
                 print("=" * 70)
 
-                return {
-                "success": True,
-                "reason": "Tous les tests ont été validés avant la limite d'itérations",
-                "iterations_used": iteration,
-                "files_processed": len(files),
-                "bugs_fixed": total_bugs_fixed,
-                "tests_passed": tests_passed,
-                "total_tests": tests_total,
-                "success_rate": success_rate,
-                "threshold": self.success_threshold,
-                "output_directory": str(self.target_directory)
-               }
+                return self._build_report(
+                    True, reason, iteration, len(files),
+                    total_bugs_fixed, tests_passed, tests_total
+                )
 
-            
-            # Si c'est la dernière itération et on a encore échoué
+            # Si c'est la dernière itération, trancher selon le seuil
             if iteration == self.max_iterations:
-                # NOUVELLE LOGIQUE: Évaluer le succès selon le seuil
-              is_successful, reason = self._evaluate_success(validation_result)
-              if is_successful:
-                print("\n" + "=" * 70)
-                print("                ✅ SUCCÈS - Code refactoré et validé!")
-                print(f"                   {reason}")
-                print("=" * 70)
-                
-                return {
-                    "success": True,
-                    "reason": reason,
-                    "iterations_used": iteration,
-                    "files_processed": len(files),
-                    "bugs_fixed": total_bugs_fixed,
-                    "tests_passed": tests_passed,
-                    "total_tests": tests_total,
-                    "success_rate": success_rate,
-                    "threshold": self.success_threshold,
-                    "output_directory": str(self.target_directory)
-                }
-              else :
-                print("\n" + "=" * 70)
-                print(f"                ⚠️  LIMITE ATTEINTE : {self.max_iterations} itérations max")
-                print(f"                   {reason}")
-                print("=" * 70)
-                
-                return {
-                    "success": False,
-                    "error": reason,
-                    "iterations_used": iteration,
-                    "files_processed": len(files),
-                    "bugs_fixed": total_bugs_fixed,
-                    "tests_passed": tests_passed,
-                    "total_tests": tests_total,
-                    "success_rate": success_rate,
-                    "threshold": self.success_threshold,
-                    "output_directory": str(self.target_directory)
-                }
-        
+                if success:
+                    print("\n" + "=" * 70)
+                    print("                ✅ SUCCÈS - Code refactoré et validé!")
+                    print(f"                   {reason}")
+                    print("=" * 70)
+                else:
+                    print("\n" + "=" * 70)
+                    print(f"                ⚠️  LIMITE ATTEINTE : {self.max_iterations} itérations max")
+                    print(f"                   {reason}")
+                    print("=" * 70)
+
+                return self._build_report(
+                    success, reason, iteration, len(files),
+                    total_bugs_fixed, tests_passed, tests_total
+                )
+
         # Cas par défaut (ne devrait jamais arriver)
-        return {
-            "success": False,
-            "error": "Erreur inconnue",
-            "iterations_used": self.max_iterations,
-            "files_processed": len(files),
-            "bugs_fixed": total_bugs_fixed,
-            "tests_passed": 0,
-            "total_tests": 0,
-            "success_rate": 0.0,
-            "threshold": self.success_threshold
-        }
\ No newline at end of file
+        return self._build_report(
+            False, "Erreur inconnue", self.max_iterations, len(files),
+            total_bugs_fixed, 0, 0
+        )
\ No newline at end of file
@@ -26,8 +26,11 @@ class DummyJudge:
         return {"passed": True, "tests_passed": 1, "tests_total": 1}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def orch_module():
+    # Une résolution par session suffit : le module est idempotent via
+    # sys.modules et monkeypatch (function-scoped) peut toujours patcher
+    # ses attributs test par test
     return importlib.import_module("src.orchestrator.swarm_orchestrator")
 
 
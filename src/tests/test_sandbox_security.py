@@ -1,15 +1,10 @@
-import importlib
-from pathlib import Path
-import pytest
-
-
-def test_sandbox_folder_exists():
+def test_sandbox_folder_exists(tmp_path):
     """
     Vérifie que le dossier sandbox peut exister / être créé.
     """
-    sandbox = Path("sandbox")
-    sandbox.mkdir(exist_ok=True)
+    # tmp_path plutôt que le répertoire de travail : pas d'effet de bord
+    # persistant dans le dépôt et le répertoire est nettoyé par pytest
+    sandbox = tmp_path / "sandbox"
+    sandbox.mkdir()
     assert sandbox.exists()
     assert sandbox.is_dir()
-
-
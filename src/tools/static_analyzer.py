@@ -2,44 +2,122 @@
 static_analyzer.py - Interface avec Pylint
 Analyse statique du code Python
 """
-import subprocess
+import atexit
+import hashlib
 import json
+import os
+import threading
+from io import StringIO
 from pathlib import Path
 from typing import Tuple, List, Dict
-import re
-import sys
+
+import orjson
+from astroid import MANAGER as _ASTROID_MANAGER
+from pylint import __version__ as _PYLINT_VERSION
+from pylint.lint import Run
+from pylint.reporters.json_reporter import JSONReporter
+
+
+# Dossiers élagués lors de la découverte des fichiers à analyser
+_IGNORED_DIRS = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules",
+    ".mypy_cache", ".pytest_cache",
+}
+
+# L'API pylint en processus n'est pas thread-safe : PyLinter.check
+# modifie puis restaure le sys.path GLOBAL (augmented_sys_path), et
+# l'éviction du cache astroid est elle aussi partagée. L'Auditeur
+# appelant run_pylint_on_file depuis un pool de threads, les runs sont
+# sérialisés derrière ce verrou (les appels LLM, eux, restent
+# parallèles) pour éviter faux import-errors et scores corrompus
+_PYLINT_LOCK = threading.Lock()
+
+# Cache persistant des résultats pylint, clé = hash du contenu + version
+# de pylint : relinter un fichier inchangé entre deux itérations (ou deux
+# runs) ne refait aucune inférence astroid
+_CACHE_PATH = Path("logs/pylint_cache.json")
+_pylint_cache = None
+
+
+def _load_pylint_cache() -> dict:
+    """Charge le cache pylint (lazy, dict vide si absent/corrompu)"""
+    global _pylint_cache
+    if _pylint_cache is None:
+        try:
+            _pylint_cache = orjson.loads(_CACHE_PATH.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            _pylint_cache = {}
+        atexit.register(_save_pylint_cache)
+    return _pylint_cache
+
+
+def _save_pylint_cache():
+    """Persiste le cache pylint sur disque"""
+    try:
+        _CACHE_PATH.parent.mkdir(exist_ok=True)
+        with open(_CACHE_PATH, 'wb') as f:
+            f.write(orjson.dumps(_pylint_cache))
+    except OSError as e:
+        print(f"   ⚠️  Impossible d'écrire le cache pylint : {e}")
+
 
 def run_pylint_on_file(file_path: str) -> Tuple[float, List[Dict]]:
     path = Path(file_path)
-    
+
     if not path.exists():
         return 0.0, [{"error": f"Fichier {file_path} introuvable"}]
-    
+
+    # Consultation du cache par hash du contenu (blake2b, plus rapide
+    # que sha256) : un fichier inchangé rend son résultat immédiatement
+    cache = _load_pylint_cache()
     try:
-        # Appel PyLint pour récupérer le score (texte normal)
-        result = subprocess.run(
-            [sys.executable, "-m", "pylint", str(path)],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        # Score
-        report = result.stdout + "\n" + result.stderr
-        score = extract_score_from_output(report)
+        content = path.read_bytes()
+        cache_key = (f"{hashlib.blake2b(content, digest_size=16).hexdigest()}"
+                     f":{_PYLINT_VERSION}")
+    except OSError:
+        content = None
+        cache_key = None
+
+    # Court-circuit des fichiers triviaux : pylint coûte plusieurs
+    # secondes même sur un fichier vide, alors qu'un fichier sans la
+    # moindre ligne de code ne peut rien avoir à signaler
+    if content is not None and all(
+        not line.strip() or line.lstrip().startswith(b"#")
+        for line in content.splitlines()
+    ):
+        return 10.0, []
+    if cache_key is not None and cache_key in cache:
+        cached_score, cached_issues = cache[cache_key]
+        return cached_score, cached_issues
+
+    try:
+        # Appel pylint EN PROCESSUS (API Python) : évite de payer le
+        # démarrage d'un interpréteur + warm-up astroid (~300-800 ms)
+        # à chaque fichier, et fournit score + issues en une seule passe.
+        # Le cache d'inférence astroid vit au niveau du processus : les
+        # appels suivants (itérations du Juge comprises) en profitent
+        output = StringIO()
+        reporter = JSONReporter(output)
+        with _PYLINT_LOCK:
+            # Le contenu a changé (ou est inconnu) : on évince uniquement
+            # l'AST du module concerné du cache astroid, jamais le cache
+            # entier — les AST de la stdlib et des dépendances restent
+            # chauds entre les analyses, ce qui est l'essentiel du coût
+            # d'un run pylint
+            _ASTROID_MANAGER.astroid_cache.pop(path.stem, None)
+            run = Run([str(path)], reporter=reporter, exit=False)
+
+        # Score global calculé par pylint (None si erreur fatale)
+        score = getattr(run.linter.stats, "global_note", None)
         if score is None:
             score = 0.0
-        
-        # Appel séparé pour JSON si nécessaire (issues)
+        else:
+            score = round(score, 2)
+
+        # Issues au format JSON émises par le reporter
         try:
-            result_json = subprocess.run(
-                [sys.executable, "-m", "pylint", str(path), "--output-format=json"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            issues = json.loads(result_json.stdout)
-        except Exception:
+            issues = json.loads(output.getvalue() or "[]")
+        except json.JSONDecodeError:
             issues = []
 
         formatted_issues = [
@@ -53,20 +131,17 @@ def run_pylint_on_file(file_path: str) -> Tuple[float, List[Dict]]:
             }
             for issue in issues
         ]
-        
+
+        # Mémorisation du résultat (les erreurs ne sont pas cachées)
+        if cache_key is not None:
+            cache[cache_key] = [score, formatted_issues]
+
         return score, formatted_issues
-    
+
     except Exception as e:
         return 0.0, [{"error": f"Erreur pylint: {str(e)}"}]
 
 
-def extract_score_from_output(report: str) -> float:
-    match = re.search(r"rated at (-?\d+(\.\d+)?)/10", report)
-    if match:
-        return float(match.group(1))
-    return None
-
-
 def run_pylint_on_directory(directory: str) -> Dict:
     """
     Exécute pylint sur tous les fichiers d'un répertoire
@@ -78,35 +153,76 @@ def run_pylint_on_directory(directory: str) -> Dict:
         Dict avec les résultats agrégés
     """
     path = Path(directory)
-    
+
     if not path.exists() or not path.is_dir():
         return {"error": f"{directory} n'est pas un répertoire valide"}
-    
-    python_files = list(path.rglob("*.py"))
-    
+
+    # Parcours os.scandir avec pile explicite : les dossiers ignorés
+    # sont élagués à la branche (rglob les traversait puis filtrait sur
+    # la chaîne du chemin) et le type de chaque entrée vient du dirent,
+    # sans stat supplémentaire
+    python_files = []
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif (entry.name.endswith(".py")
+                          and entry.is_file(follow_symlinks=False)):
+                        python_files.append(entry.path)
+        except PermissionError:
+            continue
+
     if not python_files:
         return {
             "average_score": 0.0,
             "files_analyzed": 0,
             "total_issues": 0
         }
-    
-    total_score = 0.0
-    all_issues = []
-    
-    for py_file in python_files:
-        if "__pycache__" in str(py_file):
-            continue
-        
-        score, issues = run_pylint_on_file(str(py_file))
-        total_score += score
-        all_issues.extend(issues)
-    
-    files_count = len([f for f in python_files if "__pycache__" not in str(f)])
-    
+
+    try:
+        # Un seul passage pylint pour tout le répertoire : le linter et
+        # le cache astroid sont construits une fois au lieu d'une fois
+        # par fichier, et le score global est calculé par pylint.
+        # --jobs=0 laisse pylint répartir les fichiers sur tous les
+        # cœurs (fork interne, stats fusionnées) dès qu'il y en a
+        # plusieurs à analyser
+        output = StringIO()
+        reporter = JSONReporter(output)
+        jobs = 0 if len(python_files) > 1 else 1
+        with _PYLINT_LOCK:
+            run = Run([f"--jobs={jobs}", *python_files],
+                      reporter=reporter, exit=False)
+
+        score = getattr(run.linter.stats, "global_note", None)
+        score = 0.0 if score is None else round(score, 2)
+
+        try:
+            issues = json.loads(output.getvalue() or "[]")
+        except json.JSONDecodeError:
+            issues = []
+    except Exception as e:
+        return {"error": f"Erreur pylint: {str(e)}"}
+
+    all_issues = [
+        {
+            "file": issue.get("path", ""),
+            "type": issue.get("type", "unknown"),
+            "line": issue.get("line", 0),
+            "column": issue.get("column", 0),
+            "message": issue.get("message", ""),
+            "symbol": issue.get("symbol", ""),
+            "message_id": issue.get("message-id", "")
+        }
+        for issue in issues
+    ]
+
     return {
-        "average_score": round(total_score / files_count, 2) if files_count > 0 else 0.0,
-        "files_analyzed": files_count,
+        "average_score": score,
+        "files_analyzed": len(python_files),
         "total_issues": len(all_issues),
         "issues": all_issues[:20]  # Top 20 issues
     }
@@ -3,26 +3,78 @@ test_runner.py - Interface avec Pytest (VERSION ULTIME)
 Extraction COMPLÈTE des erreurs sans troncature
 """
 import subprocess
-import json
 import os
 import re
+import sys
+import collections
+import copy
+import importlib.util
+import itertools
+import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
+import orjson
 
-def run_pytest_on_directory(directory: str, timeout: int = 60) -> Dict:
+# Répertoire des rapports JSON : tmpfs si la plateforme en expose un
+# d'accessible en écriture
+_REPORT_DIR = (
+    Path("/dev/shm")
+    if Path("/dev/shm").is_dir() and os.access("/dev/shm", os.W_OK)
+    else Path(tempfile.gettempdir())
+)
+
+# Mémoïsation des résultats : si ni les tests ni les sources n'ont bougé
+# entre deux itérations de l'orchestrateur, relancer pytest produirait
+# le même verdict. Borné aux 16 dernières clés
+_RESULT_CACHE = collections.OrderedDict()
+_RESULT_CACHE_MAX = 16
+
+
+def _dir_state_key(path: Path) -> tuple:
+    """Empreinte (chemin, mtime, taille) des .py dont dépend le verdict
+
+    Le résultat des tests dépend aussi des modules sources importés : si
+    le répertoire est un "tests/", l'empreinte couvre l'arbre parent.
+    """
+    root = path.parent if path.name == "tests" else path
+    entries = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "__pycache__":
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        st = entry.stat(follow_symlinks=False)
+                        entries.append(
+                            (entry.path, st.st_mtime_ns, st.st_size)
+                        )
+        except OSError:
+            continue
+    return tuple(sorted(entries))
+
+
+def run_pytest_on_directory(directory: str, timeout: int = 60,
+                            max_errors: int = None) -> Dict:
     """
     Exécute pytest avec extraction COMPLÈTE des erreurs
-    
+
     Args:
         directory: Chemin du répertoire contenant les tests
         timeout: Timeout en secondes
-        
+        max_errors: Nombre maximal d'erreurs détaillées à extraire
+            (None = toutes ; 0 = compteurs seuls, aucun nettoyage payé)
+
     Returns:
         Dict avec passed_count, failed_count, total_count, error_logs détaillés
     """
     path = Path(directory)
-    
+
     if not path.exists():
         return {
             "passed_count": 0,
@@ -34,104 +86,217 @@ def run_pytest_on_directory(directory: str, timeout: int = 60) -> Dict:
                 "traceback": ""
             }]
         }
-    
-    # Fichier JSON temporaire
-    report_file = Path("test_report.json")
+
+    cache_key = (str(path), timeout, max_errors, _dir_state_key(path))
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is not None:
+        _RESULT_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(cached)
+
+    result = _run_pytest([str(path)], timeout, max_errors)
+
+    _RESULT_CACHE[cache_key] = copy.deepcopy(result)
+    while len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+        _RESULT_CACHE.popitem(last=False)
+
+    return result
+
+
+def run_pytest_on_directories(directories: list, timeout: int = 60,
+                              max_errors: int = None) -> Dict:
+    """
+    Exécute pytest sur plusieurs répertoires en UN SEUL subprocess
+
+    Lancer un pytest par répertoire paye le démarrage de l'interpréteur
+    et le chargement des plugins à chaque fois ; ici tous les répertoires
+    sont passés à la même invocation et le rapport JSON agrège tout.
+
+    Args:
+        directories: Liste de chemins de répertoires de tests
+        timeout: Timeout en secondes (pour l'ensemble)
+
+    Returns:
+        Dict agrégé avec passed_count, failed_count, total_count, error_logs
+    """
+    targets = [str(d) for d in directories if Path(d).exists()]
+
+    if not targets:
+        return {
+            "passed_count": 0,
+            "failed_count": 1,
+            "total_count": 1,
+            "error_logs": [{
+                "test": "directory_check",
+                "message": "Aucun répertoire de tests existant",
+                "traceback": ""
+            }]
+        }
+
+    return _run_pytest(targets, timeout, max_errors)
+
+
+@lru_cache(maxsize=1)
+def _xdist_available() -> bool:
+    """Vérifie une fois par processus si pytest-xdist est installé"""
+    return importlib.util.find_spec("xdist") is not None
+
+
+def _use_xdist(targets: list) -> bool:
+    """Active xdist dès 4 fichiers de tests (arrêt du comptage à 4 :
+    le démarrage des workers ne se justifie pas en dessous)"""
+    if not _xdist_available():
+        return False
+    count = 0
+    for target in targets:
+        for _ in Path(target).rglob("test_*.py"):
+            count += 1
+            if count >= 4:
+                return True
+    return False
+
+
+def _iter_failed(tests: list):
+    """Génère les dicts d'erreur des tests échoués, un à la fois"""
+    for test in tests:
+        if test.get("outcome") != "failed":
+            continue
+
+        # Nom complet du test (SANS troncature)
+        test_nodeid = test.get("nodeid", "unknown_test")
+
+        # Extraire juste le nom de la fonction de test
+        test_name = test_nodeid
+        if "::" in test_nodeid:
+            test_name = test_nodeid.split("::")[-1]
+
+        # Extraire le message d'erreur COMPLET
+        call_info = test.get("call", {})
+        message = ""
+        traceback_text = ""
+
+        # Méthode 1: longrepr (le plus détaillé)
+        if "longrepr" in call_info:
+            longrepr = call_info["longrepr"]
+            if isinstance(longrepr, str):
+                # Borne d'entrée : les slices finaux gardent au plus
+                # 1500/800 caractères, inutile de faire travailler regex
+                # et nettoyage sur des tracebacks de plusieurs Mo
+                longrepr = longrepr[:4096]
+                traceback_text = longrepr
+
+                # Extraire le message d'erreur principal : une seule
+                # passe de l'alternation compilée sur tout le traceback
+                # (au lieu d'un scan par token et par ligne), puis
+                # extraction de la ligne contenant le match
+                err_match = _ANY_ERR_RE.search(longrepr)
+                if err_match:
+                    start = longrepr.rfind('\n', 0, err_match.start()) + 1
+                    end = longrepr.find('\n', err_match.start())
+                    if end == -1:
+                        end = len(longrepr)
+                    message = longrepr[start:end].strip()
+                else:
+                    # Sinon, dernière ligne non-indentée
+                    for line in reversed(longrepr.strip().split('\n')):
+                        if line.strip() and not line.startswith(' '):
+                            message = line.strip()
+                            break
+
+        # Méthode 2: crash.message
+        if not message and "crash" in call_info:
+            crash_msg = call_info["crash"].get("message", "")
+            if crash_msg:
+                message = crash_msg
+
+        # Méthode 3: Fallback
+        if not message:
+            message = f"Test failed: {test.get('outcome', 'unknown')}"
+
+        # 🔥 NETTOYER LE MESSAGE POUR LE RENDRE PLUS CLAIR
+        message = _clean_error_message(message, traceback_text)
+
+        yield {
+            "test": test_name,  # Nom court: test_divide_by_zero
+            "test_full_path": test_nodeid,  # Chemin complet
+            "message": message[:800],  # Message nettoyé
+            "traceback": traceback_text[:1500]  # Traceback complet
+        }
+
+
+def _run_pytest(targets: list, timeout: int, max_errors: int = None) -> Dict:
+    """Invocation pytest commune (un ou plusieurs chemins cibles)"""
+    # Fichier JSON temporaire, unique par processus ET par thread :
+    # permet de lancer plusieurs répertoires en parallèle sans que les
+    # exécutions n'écrasent mutuellement leur rapport. Écrit sur tmpfs
+    # (/dev/shm) quand disponible : le rapport vit en RAM, aucune
+    # écriture SSD à chaque itération de l'orchestrateur
+    report_file = _REPORT_DIR / (
+        f"test_report_{os.getpid()}_{threading.get_ident()}.json"
+    )
     
     try:
-        # Exécuter pytest avec verbose et JSON
+        # Exécuter pytest avec rapport JSON. Sans -v (la sortie
+        # verbeuse par test n'est jamais lue), sans indentation du
+        # rapport (parsé machine), sans écriture de .pytest_cache
+        # (I/O qui domine les runs courts), sans capture stdout/stderr
+        # (-s : le rapport JSON fait foi, inutile de payer la machinerie
+        # de capture), sans en-tête ni résumé de warnings
+        # sys.executable -m pytest : pas de résolution PATH ni de passage
+        # par le script console pytest (un exec de moins), et la garantie
+        # d'utiliser le même interpréteur que le swarm
         cmd = [
-            "pytest",
-            str(path),
-            "-v",
+            sys.executable, "-m", "pytest",
+            *targets,
+            "-q",
             "--tb=short",
+            "-s",
+            "--no-header",
+            "--disable-warnings",
+            "-p", "no:cacheprovider",
             f"--json-report",
-            f"--json-report-file={report_file}",
-            "--json-report-indent=2",
-            "-o", "python_files=*.py"
+            f"--json-report-file={report_file}"
         ]
+
+        # Répartition sur les cœurs quand xdist est disponible et que la
+        # suite est assez grosse pour amortir les workers ; loadfile
+        # garde les tests d'un même fichier sur le même worker
+        if _use_xdist(targets):
+            cmd += ["-n", "auto", "--dist", "loadfile"]
         
+        # bufsize transmis au Popen sous-jacent : gros tampon de pipe
+        # plutôt que le défaut, pour les sorties volumineuses ; -q
+        # réduit de toute façon le trafic (le rapport JSON fait foi)
         result = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
+            bufsize=1 << 20,
             timeout=timeout,
             cwd=os.getcwd()
         )
         
-        # Lire le rapport JSON
+        # Lire le rapport JSON (orjson sur les octets bruts : pas de
+        # décodage texte intermédiaire, parsing en C — les rapports de
+        # grosses suites font plusieurs Mo)
         if report_file.exists():
-            with open(report_file, 'r', encoding='utf-8') as f:
-                report_data = json.load(f)
-            
+            report_data = orjson.loads(report_file.read_bytes())
+
             # Extraire statistiques
             summary = report_data.get("summary", {})
             passed = summary.get("passed", 0)
             failed = summary.get("failed", 0)
             total = summary.get("total", 0)
             
-            # 🔥 EXTRACTION ULTRA-DÉTAILLÉE DES ERREURS
-            error_logs = []
-            for test in report_data.get("tests", []):
-                if test.get("outcome") == "failed":
-                    # Nom complet du test (SANS troncature)
-                    test_nodeid = test.get("nodeid", "unknown_test")
-                    
-                    # Extraire juste le nom de la fonction de test
-                    test_name = test_nodeid
-                    if "::" in test_nodeid:
-                        test_name = test_nodeid.split("::")[-1]
-                    
-                    # Extraire le message d'erreur COMPLET
-                    call_info = test.get("call", {})
-                    message = ""
-                    traceback_text = ""
-                    
-                    # Méthode 1: longrepr (le plus détaillé)
-                    if "longrepr" in call_info:
-                        longrepr = call_info["longrepr"]
-                        if isinstance(longrepr, str):
-                            traceback_text = longrepr
-                            
-                            # Extraire le message d'erreur principal
-                            # Chercher les lignes qui contiennent l'erreur
-                            lines = longrepr.strip().split('\n')
-                            
-                            # Chercher AssertionError, ValueError, etc.
-                            for line in lines:
-                                if any(err in line for err in ['AssertionError', 'ValueError', 'ZeroDivisionError', 'TypeError', 'Error']):
-                                    message = line.strip()
-                                    break
-                            
-                            # Si pas trouvé, prendre la dernière ligne non-vide
-                            if not message:
-                                for line in reversed(lines):
-                                    if line.strip() and not line.startswith(' '):
-                                        message = line.strip()
-                                        break
-                    
-                    # Méthode 2: crash.message
-                    if not message and "crash" in call_info:
-                        crash_msg = call_info["crash"].get("message", "")
-                        if crash_msg:
-                            message = crash_msg
-                    
-                    # Méthode 3: Fallback
-                    if not message:
-                        message = f"Test failed: {test.get('outcome', 'unknown')}"
-                    
-                    # 🔥 NETTOYER LE MESSAGE POUR LE RENDRE PLUS CLAIR
-                    message = _clean_error_message(message, traceback_text)
-                    
-                    error_logs.append({
-                        "test": test_name,  # Nom court: test_divide_by_zero
-                        "test_full_path": test_nodeid,  # Chemin complet
-                        "message": message[:800],  # Message nettoyé
-                        "traceback": traceback_text[:1500]  # Traceback complet
-                    })
-            
+            # 🔥 EXTRACTION ULTRA-DÉTAILLÉE DES ERREURS (paresseuse :
+            # regex et nettoyage ne tournent que pour les erreurs
+            # effectivement consommées)
+            failed_iter = _iter_failed(report_data.get("tests", []))
+            if max_errors is not None:
+                failed_iter = itertools.islice(failed_iter, max_errors)
+            error_logs = list(failed_iter)
+
             # Nettoyer le fichier
-            report_file.unlink()
+            report_file.unlink(missing_ok=True)
             
             return {
                 "passed_count": passed,
@@ -199,7 +364,7 @@ def _clean_error_message(message: str, traceback: str) -> str:
     # Si c'est une AssertionError avec pytest.raises
     if 'DID NOT RAISE' in message.upper() or 'did not raise' in message:
         # Extraire quelle exception était attendue
-        expected_match = re.search(r'Expected\s+(\w+)', message, re.IGNORECASE)
+        expected_match = _EXPECTED_RE.search(message)
         if expected_match:
             expected_exc = expected_match.group(1)
             return f"Expected {expected_exc} but no exception was raised"
@@ -207,7 +372,7 @@ def _clean_error_message(message: str, traceback: str) -> str:
     
     # Si c'est "Failed: DID NOT RAISE <exception>"
     if 'Failed: DID NOT RAISE' in message:
-        exc_match = re.search(r'DID NOT RAISE <class \'(\w+)\'>', message)
+        exc_match = _DID_NOT_RAISE_RE.search(message)
         if exc_match:
             exc_type = exc_match.group(1)
             return f"Expected {exc_type} exception but got different exception or no exception"
@@ -215,8 +380,8 @@ def _clean_error_message(message: str, traceback: str) -> str:
     # Chercher dans le traceback pour plus de contexte
     if traceback and 'with pytest.raises' in traceback:
         # C'est un test qui attend une exception
-        exc_type_match = re.search(r'with pytest\.raises\((\w+)\)', traceback)
-        raised_exc_match = re.search(r'(ValueError|ZeroDivisionError|TypeError|KeyError|IndexError|AttributeError):', traceback)
+        exc_type_match = _PYTEST_RAISES_RE.search(traceback)
+        raised_exc_match = _RAISED_EXC_RE.search(traceback)
         
         if exc_type_match and raised_exc_match:
             expected = exc_type_match.group(1)
@@ -227,38 +392,46 @@ def _clean_error_message(message: str, traceback: str) -> str:
     return message
 
 
+# Compteurs de la ligne de résumé pytest ("3 passed, 1 failed in ...") :
+# compilés une fois au chargement du module
+_PASSED_RE = re.compile(r"(\d+) passed", re.IGNORECASE)
+_FAILED_RE = re.compile(r"(\d+) failed", re.IGNORECASE)
+
+# Motifs de nettoyage des messages d'erreur, compilés une fois plutôt
+# qu'à chaque test échoué (le hash + lookup du cache interne de re se
+# paye à chaque re.search inline)
+_EXPECTED_RE = re.compile(r'Expected\s+(\w+)', re.IGNORECASE)
+_DID_NOT_RAISE_RE = re.compile(r'DID NOT RAISE <class \'(\w+)\'>')
+_PYTEST_RAISES_RE = re.compile(r'with pytest\.raises\((\w+)\)')
+_RAISED_EXC_RE = re.compile(
+    r'(ValueError|ZeroDivisionError|TypeError|KeyError|IndexError|AttributeError):'
+)
+_FAILED_LINE_RE = re.compile(r'FAILED\s+([\w/:.]+)\s*-\s*(.*)')
+# Alternation unique sur les types d'erreur : le moteur re parcourt le
+# traceback en une passe linéaire, toutes alternatives confondues
+_ANY_ERR_RE = re.compile(
+    r'(?:AssertionError|ValueError|ZeroDivisionError|TypeError'
+    r'|KeyError|IndexError|AttributeError|Error)'
+)
+
+
 def parse_pytest_output(stdout: str, stderr: str, returncode: int) -> Dict:
     """
     Parse la sortie texte de pytest (fallback)
     """
-    passed = 0
-    failed = 0
     error_logs = []
-    
+
     output = stdout + "\n" + stderr
-    
-    # Extraire passed/failed
-    for line in output.split('\n'):
-        line_lower = line.lower()
-        
-        if 'passed' in line_lower:
-            try:
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if 'passed' in part and i > 0:
-                        passed = int(parts[i-1])
-            except:
-                pass
-        
-        if 'failed' in line_lower:
-            try:
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if 'failed' in part and i > 0:
-                        failed = int(parts[i-1])
-            except:
-                pass
-    
+
+    # Le résumé est toujours en fin de sortie : une recherche regex sur
+    # les derniers 2 Ko suffit, au lieu de découper et re-tokeniser
+    # chaque ligne du log complet
+    tail = output[-2048:]
+    passed_match = _PASSED_RE.search(tail)
+    failed_match = _FAILED_RE.search(tail)
+    passed = int(passed_match.group(1)) if passed_match else 0
+    failed = int(failed_match.group(1)) if failed_match else 0
+
     # Si pas de tests
     if passed == 0 and failed == 0:
         if returncode == 0:
@@ -280,7 +453,7 @@ def parse_pytest_output(stdout: str, stderr: str, returncode: int) -> Dict:
     # Extraire les erreurs
     if failed > 0:
         # Chercher FAILED
-        failed_tests = re.findall(r'FAILED\s+([\w/:.]+)\s*-\s*(.*)', output)
+        failed_tests = _FAILED_LINE_RE.findall(output)
         
         if failed_tests:
             for test_path, error_msg in failed_tests:
@@ -308,11 +481,13 @@ def parse_pytest_output(stdout: str, stderr: str, returncode: int) -> Dict:
     }
 
 
+@lru_cache(maxsize=1)
 def check_pytest_installed() -> bool:
-    """Vérifie si pytest est installé"""
+    """Vérifie si pytest est installé (mémoïsé : le statut d'installation
+    ne change pas pendant la vie du processus, un seul subprocess suffit)"""
     try:
         result = subprocess.run(
-            ["pytest", "--version"],
+            [sys.executable, "-m", "pytest", "--version"],
             capture_output=True,
             timeout=5
         )
@@ -0,0 +1,87 @@
+"""
+llm_cache.py - Cache disque des réponses LLM
+Mémoïse les appels Gemini par hash du prompt : un prompt identique
+(même code source, même consigne) ne repaye ni le réseau ni l'inférence
+"""
+import hashlib
+import time
+from pathlib import Path
+
+# Répertoire du cache, un fichier par entrée réparti sur 256 sous-dossiers
+_CACHE_DIR = Path(".llm_cache")
+
+# Marqueurs de troncature : tout ce qui suit est du bruit de génération
+# ('<ctrl63>', '<|endoftext|>', etc. commencent tous par l'un des deux)
+_TRUNC_MARKERS = ('<ctrl', '<|')
+
+
+def _stream_text(model, prompt: str) -> str:
+    """
+    Appelle Gemini en streaming et agrège la réponse
+
+    Le streaming recouvre le transfert réseau avec l'agrégation, et un
+    marqueur de troncature détecté en cours de route coupe le stream
+    immédiatement au lieu de payer la génération jusqu'au plafond de
+    tokens pour jeter la fin ensuite.
+    """
+    parts = []
+    tail = ""
+    for chunk in model.generate_content(prompt, stream=True):
+        chunk_text = getattr(chunk, "text", "") or ""
+        if not chunk_text:
+            continue
+
+        # Détection incrémentale (fenêtre chevauchant la frontière entre
+        # chunks, sans rejoindre tout le buffer à chaque itération)
+        if any(marker in tail + chunk_text for marker in _TRUNC_MARKERS):
+            parts.append(chunk_text)
+            full = "".join(parts)
+            cut = min(i for i in (full.find(m) for m in _TRUNC_MARKERS)
+                      if i >= 0)
+            return full[:cut].rstrip()
+
+        parts.append(chunk_text)
+        tail = chunk_text[-4:]
+
+    return "".join(parts)
+
+
+def cached_generate(model, prompt: str, ttl: int = 86400) -> str:
+    """
+    Appelle model.generate_content(prompt) avec cache disque
+
+    La clé est sha256(nom_du_modèle + prompt) ; une entrée est valide
+    tant que son mtime a moins de `ttl` secondes. Sur hit, l'appel LLM
+    est entièrement évité (gain de plusieurs secondes par fichier rejoué
+    à l'identique dans les boucles de retry).
+
+    Args:
+        model: Instance GenerativeModel
+        prompt: Prompt complet à envoyer
+        ttl: Durée de vie d'une entrée en secondes (défaut: 24h)
+
+    Returns:
+        Texte de la réponse (depuis le cache ou le LLM)
+    """
+    model_name = getattr(model, "model_name", "")
+    key = hashlib.sha256(
+        f"{model_name}\x00{prompt}".encode("utf-8")
+    ).hexdigest()
+    entry = _CACHE_DIR / key[:2] / key
+
+    try:
+        if entry.exists() and (time.time() - entry.stat().st_mtime) < ttl:
+            return entry.read_bytes().decode("utf-8")
+    except OSError:
+        pass  # Cache illisible : on retombe sur l'appel LLM
+
+    text = _stream_text(model, prompt)
+
+    if text:
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            entry.write_text(text, encoding="utf-8")
+        except OSError:
+            pass  # Cache non inscriptible : la réponse reste utilisable
+
+    return text
@@ -0,0 +1,108 @@
+"""
+log_queue.py - Écriture différée des logs d'expérience
+File en mémoire + thread démon : l'appelant ne paye qu'un put_nowait,
+les entrées sont regroupées et écrites par rafale (write-behind)
+"""
+import atexit
+import os
+import queue
+import sys
+import threading
+
+import orjson
+
+_Q = queue.Queue()
+_FLUSH_BATCH = 32      # taille de rafale déclenchant une écriture
+_IDLE_TIMEOUT = 0.1    # secondes sans nouvelle entrée avant flush
+
+_worker_started = False
+_start_lock = threading.Lock()
+
+
+def enqueue(log_file: str, entry: dict) -> None:
+    """
+    Dépose une entrée à écrire ; démarre le flusher au premier appel
+
+    L'appel est non bloquant : l'ouverture de fichier, la sérialisation
+    et le write() sortent du chemin chaud des agents.
+    """
+    global _worker_started
+    if not _worker_started:
+        with _start_lock:
+            if not _worker_started:
+                threading.Thread(target=_worker, daemon=True).start()
+                atexit.register(_drain)
+                _worker_started = True
+    _Q.put_nowait((log_file, entry))
+
+
+def _flush(items) -> None:
+    """Écrit une rafale d'entrées, regroupées par fichier cible"""
+    by_file = {}
+    for log_file, entry in items:
+        by_file.setdefault(log_file, []).append(entry)
+
+    for log_file, entries in by_file.items():
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        payload = b''.join(
+            orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+            for entry in entries
+        )
+        # Un seul open/write/close par rafale au lieu d'un par entrée
+        with open(log_file, 'ab') as f:
+            f.write(payload)
+
+
+def _flush_and_ack(buf: list) -> None:
+    """Écrit la rafale puis acquitte chaque entrée (task_done), même en
+    cas d'échec d'écriture, pour ne jamais bloquer flush()
+
+    Une rafale qui échoue est abandonnée avec un avertissement : laisser
+    l'exception tuer le thread démon condamnerait toutes les entrées
+    suivantes (le worker n'est jamais redémarré)
+    """
+    try:
+        _flush(buf)
+    except Exception as e:
+        print(f"⚠️  Rafale de logs perdue ({len(buf)} entrées) : {e}",
+              file=sys.stderr)
+    finally:
+        for _ in buf:
+            _Q.task_done()
+        buf.clear()
+
+
+def _worker() -> None:
+    """Boucle du thread démon : regroupe puis écrit"""
+    buf = []
+    while True:
+        try:
+            buf.append(_Q.get(timeout=_IDLE_TIMEOUT))
+            if len(buf) >= _FLUSH_BATCH:
+                _flush_and_ack(buf)
+        except queue.Empty:
+            # Plus rien n'arrive : on écrit ce qui est en attente
+            if buf:
+                _flush_and_ack(buf)
+
+
+def flush() -> None:
+    """Bloque jusqu'à ce que toutes les entrées déposées soient écrites
+
+    Utile aux tests et aux points de synchronisation : s'appuie sur le
+    comptage task_done de la file, y compris pour les entrées déjà
+    prises par le thread démon mais pas encore écrites.
+    """
+    _Q.join()
+
+
+def _drain() -> None:
+    """Vide ce qui reste dans la file à la fin du processus (atexit)"""
+    items = []
+    while True:
+        try:
+            items.append(_Q.get_nowait())
+        except queue.Empty:
+            break
+    if items:
+        _flush_and_ack(items)
@@ -1,11 +1,15 @@
 import json
 import os
 import uuid
+
+import orjson
 from datetime import datetime
 from enum import Enum
 
-# Chemin du fichier de logs
-LOG_FILE = os.path.join("logs", "experiment_data.json")
+from src.utils import log_queue
+
+# Chemin du fichier de logs (JSON Lines : une entrée par ligne, en append)
+LOG_FILE = os.path.join("logs", "experiment_data.jsonl")
 
 class ActionType(str, Enum):
     """
@@ -56,9 +60,6 @@ def log_experiment(agent_name: str, model_used: str, action: ActionType, details
             )
 
     # --- 3. PRÉPARATION DE L'ENTRÉE ---
-    # Création du dossier logs s'il n'existe pas
-    os.makedirs("logs", exist_ok=True)
-    
     entry = {
         "id": str(uuid.uuid4()),  # ID unique pour éviter les doublons lors de la fusion des données
         "timestamp": datetime.now().isoformat(),
@@ -69,21 +70,34 @@ def log_experiment(agent_name: str, model_used: str, action: ActionType, details
         "status": status
     }
 
-    # --- 4. LECTURE & ÉCRITURE ROBUSTE ---
-    data = []
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content: # Vérifie que le fichier n'est pas juste vide
-                    data = json.loads(content)
-        except json.JSONDecodeError:
-            # Si le fichier est corrompu, on repart à zéro (ou on pourrait sauvegarder un backup)
-            print(f"⚠️ Attention : Le fichier de logs {LOG_FILE} était corrompu. Une nouvelle liste a été créée.")
-            data = []
+    # --- 4. ÉCRITURE DIFFÉRÉE (JSON Lines) ---
+    # La validation ci-dessus reste synchrone (les erreurs remontent à
+    # l'appelant), mais l'écriture part dans la file du flusher : le
+    # chemin chaud ne paye qu'un put_nowait, les entrées sont regroupées
+    # et écrites en rafale par le thread démon
+    log_queue.enqueue(LOG_FILE, entry)
 
-    data.append(entry)
-    
-    # Écriture
-    with open(LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+
+def load_experiment_log(log_file: str = None) -> list:
+    """
+    Recharge le fichier de logs JSONL sous forme de liste d'entrées.
+
+    Args:
+        log_file (str): Chemin du fichier de logs (défaut: LOG_FILE).
+
+    Returns:
+        list: Les entrées de log, les lignes corrompues étant ignorées.
+    """
+    path = log_file or LOG_FILE
+    entries = []
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(orjson.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return entries
\ No newline at end of file